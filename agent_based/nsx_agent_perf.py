@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import (
+    Any,
+    Dict,
+    Mapping,
+    Optional,
+    TypedDict,
+)
+
+from .agent_based_api.v1 import (
+    check_levels,
+    register,
+    render,
+    Result,
+    Service,
+    State,
+)
+
+from .agent_based_api.v1.type_defs import (
+    StringTable,
+    CheckResult,
+    DiscoveryResult,
+)
+
+
+class EndpointData(TypedDict):
+    requests: int
+    latency: float
+    latency_p95: float
+    bytes: int
+    retries: int
+    errors: int
+
+
+class NodeData(TypedDict):
+    state: str
+    requests: int
+    latency: float
+    bytes: int
+    errors: int
+
+
+class AgentPerfData(TypedDict, total=False):
+    endpoints: Dict[str, EndpointData]
+    sections: Dict[str, float]
+    nodes: Dict[str, NodeData]
+    runtime: float
+
+
+Section = AgentPerfData
+
+
+def parse_nsx_agent_perf(string_table: StringTable) -> Section:
+    parsed = AgentPerfData(endpoints={}, sections={}, nodes={})
+
+    for line in string_table:
+        if line[0] == "endpoint":
+            parsed["endpoints"][line[1]] = EndpointData(
+                requests=int(line[2]),
+                latency=float(line[3]),
+                latency_p95=float(line[4]),
+                bytes=int(line[5]),
+                retries=int(line[6]),
+                errors=int(line[7]),
+            )
+        elif line[0] == "section":
+            parsed["sections"][line[1]] = float(line[2])
+        elif line[0] == "node":
+            parsed["nodes"][line[1]] = NodeData(
+                state=line[2],
+                requests=int(line[3]),
+                latency=float(line[4]),
+                bytes=int(line[5]),
+                errors=int(line[6]),
+            )
+        elif line[0] == "runtime":
+            parsed["runtime"] = float(line[1])
+
+    return parsed
+
+
+register.agent_section(
+    name="nsx_agent_perf",
+    parse_function=parse_nsx_agent_perf,
+)
+
+
+def discover_nsx_agent_perf(section: Section) -> DiscoveryResult:
+    if "runtime" in section:
+        yield Service()
+
+
+def check_nsx_agent_perf(
+    params: Mapping[str, Any],
+    section: Section,
+) -> CheckResult:
+    runtime = section.get("runtime")
+    if runtime is None:
+        return
+
+    yield from check_levels(
+        value=runtime,
+        levels_upper=params.get("runtime_levels"),
+        metric_name="nsx_agent_runtime",
+        render_func=render.timespan,
+        label="Run time",
+        boundaries=(0, None),
+    )
+
+    for name, seconds in section["sections"].items():
+        yield from check_levels(
+            value=seconds,
+            metric_name=f"nsx_section_runtime_{name}",
+            render_func=render.timespan,
+            label=f"Section {name}",
+            notice_only=True,
+        )
+
+
+register.check_plugin(
+    name="nsx_agent_perf",
+    service_name="NSX Agent Performance",
+    discovery_function=discover_nsx_agent_perf,
+    check_function=check_nsx_agent_perf,
+    check_ruleset_name="nsx_agent_perf",
+    check_default_parameters={
+        "runtime_levels": (45.0, 55.0),
+    },
+)
+
+
+def discover_nsx_agent_api(section: Section) -> DiscoveryResult:
+    for item in section["endpoints"]:
+        yield Service(item=item)
+
+
+def check_nsx_agent_api(item: str, section: Section) -> CheckResult:
+    endpoint: Optional[EndpointData] = section["endpoints"].get(item)
+    if endpoint is None:
+        # Sections served from their cache or failed before querying the
+        # endpoint send no requests to it
+        yield Result(state=State.OK, summary="No requests in this run")
+        return
+
+    yield from check_levels(
+        value=endpoint["requests"],
+        metric_name="nsx_api_requests",
+        render_func=lambda v: "%d" % v,
+        label="Requests",
+    )
+    yield from check_levels(
+        value=endpoint["latency"],
+        metric_name="nsx_api_latency",
+        render_func=render.timespan,
+        label="Total latency",
+    )
+    yield from check_levels(
+        value=endpoint["latency_p95"],
+        metric_name="nsx_api_latency_p95",
+        render_func=render.timespan,
+        label="95th percentile",
+    )
+    yield from check_levels(
+        value=endpoint["bytes"],
+        metric_name="nsx_api_bytes",
+        render_func=render.bytes,
+        label="Received",
+    )
+    yield from check_levels(
+        value=endpoint["retries"],
+        metric_name="nsx_api_retries",
+        render_func=lambda v: "%d" % v,
+        label="Retries",
+        notice_only=True,
+    )
+    yield from check_levels(
+        value=endpoint["errors"],
+        metric_name="nsx_api_errors",
+        render_func=lambda v: "%d" % v,
+        label="Errors",
+        notice_only=True,
+    )
+
+
+register.check_plugin(
+    name="nsx_agent_api",
+    sections=["nsx_agent_perf"],
+    service_name="NSX Agent API %s",
+    discovery_function=discover_nsx_agent_api,
+    check_function=check_nsx_agent_api,
+)
+
+
+_NODE_STATES = {
+    "up": (State.OK, "Up"),
+    "standby": (State.OK, "Standby, only used if no discovered node answers"),
+    "down": (State.WARN, "Not used, failed in an earlier run"),
+    "failed": (State.WARN, "Failed, requests were sent to other nodes"),
+}
+
+
+def discover_nsx_agent_node(section: Section) -> DiscoveryResult:
+    # A single node is already covered by the other agent services
+    if len(section.get("nodes", {})) > 1:
+        for item in section["nodes"]:
+            yield Service(item=item)
+
+
+def check_nsx_agent_node(item: str, section: Section) -> CheckResult:
+    node: Optional[NodeData] = section.get("nodes", {}).get(item)
+    if node is None:
+        return
+
+    state, text = _NODE_STATES.get(
+        node["state"], (State.UNKNOWN, "Unknown state %s" % node["state"])
+    )
+    yield Result(state=state, summary=text)
+    yield from check_levels(
+        value=node["requests"],
+        metric_name="nsx_api_requests",
+        render_func=lambda v: "%d" % v,
+        label="Requests",
+    )
+    yield from check_levels(
+        value=node["latency"],
+        metric_name="nsx_api_latency",
+        render_func=render.timespan,
+        label="Total latency",
+    )
+    yield from check_levels(
+        value=node["bytes"],
+        metric_name="nsx_api_bytes",
+        render_func=render.bytes,
+        label="Received",
+    )
+    yield from check_levels(
+        value=node["errors"],
+        metric_name="nsx_api_errors",
+        render_func=lambda v: "%d" % v,
+        label="Errors",
+        notice_only=True,
+    )
+
+
+register.check_plugin(
+    name="nsx_agent_node",
+    sections=["nsx_agent_perf"],
+    service_name="NSX Agent Node %s",
+    discovery_function=discover_nsx_agent_node,
+    check_function=check_nsx_agent_node,
+)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import (
+    Dict,
+    TypedDict,
+)
+
+from .agent_based_api.v1 import (
+    register,
+    Service,
+    Result,
+    State,
+)
+
+from .agent_based_api.v1.type_defs import (
+    StringTable,
+    CheckResult,
+    DiscoveryResult,
+)
+
+
+class SectionStatus(TypedDict):
+    status: str
+    message: str
+
+
+Section = Dict[str, SectionStatus]
+
+_STATUS_MAP = {
+    "OK": State.OK,
+    "CACHED": State.OK,
+    "STALE": State.WARN,
+    "FAILED": State.CRIT,
+}
+
+
+def parse_nsx_agent_status(string_table: StringTable) -> Section:
+    parsed: Section = {}
+
+    for line in string_table:
+        parsed[line[0]] = SectionStatus(
+            status=line[1],
+            message=line[2] if len(line) > 2 else "",
+        )
+
+    return parsed
+
+
+register.agent_section(
+    name="nsx_agent_status",
+    parse_function=parse_nsx_agent_status,
+)
+
+
+def discover_nsx_agent_status(section: Section) -> DiscoveryResult:
+    if section:
+        yield Service()
+
+
+def check_nsx_agent_status(section: Section) -> CheckResult:
+    ok = [name for name, s in section.items() if s["status"] in ["OK", "CACHED"]]
+    yield Result(
+        state=State.OK,
+        summary="%d of %d sections up to date" % (len(ok), len(section)),
+    )
+
+    for name, section_status in section.items():
+        if section_status["status"] in ["OK", "CACHED"]:
+            continue
+        text = f"{name}: {section_status['status']}"
+        if section_status["status"] == "STALE":
+            text += " (last good data sent)"
+        if section_status["message"]:
+            text += f" - {section_status['message']}"
+        yield Result(
+            state=_STATUS_MAP.get(section_status["status"], State.UNKNOWN),
+            summary=text,
+        )
+
+
+register.check_plugin(
+    name="nsx_agent_status",
+    service_name="NSX Agent Sections",
+    discovery_function=discover_nsx_agent_status,
+    check_function=check_nsx_agent_status,
+)
@@ -5,14 +5,16 @@ from typing import (
     Any,
     Dict,
     Mapping,
-    TypedDict,
+    NamedTuple,
     Optional,
 )
 
 from .agent_based_api.v1 import (
     check_levels,
     register,
+    Result,
     Service,
+    State,
 )
 
 from .agent_based_api.v1.type_defs import (
@@ -25,33 +27,41 @@ from datetime import datetime
 import json
 
 
-class CertData(TypedDict, total=False):
-    id: str
-    not_after: datetime
-    display_name: str
-    cn: str
+class CertData(NamedTuple):
+    not_after: Optional[datetime]
 
 
 Section = Dict[str, CertData]
 
 
-def parse_nsx_certificates(string_table: StringTable) -> Section:
+def _parse_not_after(value: Any) -> Optional[datetime]:
+    # NSX sends the expiry in milliseconds since epoch
+    if value is None or value == "":
+        return None
+    return datetime.fromtimestamp(int(value) / 1000)
+
+
+def _parse_nsx_certificates_json(line: str) -> Section:
+    # First version of the section: all certificates as one JSON array
     parsed: Section = {}
-    for cert in json.loads(string_table[0][0]) or []:
-        result = CertData()
-        if "id" in cert:
-            result["id"] = str(cert["id"])
-        if "not_after" in cert["details"]:
-            result["not_after"] = datetime.fromtimestamp(
-                int(cert["details"]["not_after"]) / 1000
-            )
-        if "subject_cn" in cert["details"]:
-            result["cn"] = str(cert["details"]["subject_cn"])
-        if "display_name" in cert:
-            result["display_name"] = str(cert["display_name"])
-
-        parsed.setdefault(result["display_name"], result)
+    for cert in json.loads(line) or []:
+        parsed.setdefault(
+            str(cert["display_name"]),
+            CertData(_parse_not_after(cert["details"].get("not_after"))),
+        )
+    return parsed
 
+
+def parse_nsx_certificates(string_table: StringTable) -> Section:
+    if string_table and string_table[0][0].startswith("["):
+        return _parse_nsx_certificates_json(string_table[0][0])
+
+    parsed: Section = {}
+    for row in string_table:
+        # Checkmk strips empty trailing fields, e.g. of a missing expiry
+        _cert_id, name, not_after = (row + [""] * 3)[:3]
+        if name not in parsed:
+            parsed[name] = CertData(_parse_not_after(not_after))
     return parsed
 
 
@@ -76,11 +86,14 @@ def _check_nsx_certificates(
         return
 
     label = "certificate valid for "
-    cert = section.get(item)
+    cert = section[item]
 
     # Calculate day difference
     now = datetime.now()
-    expiry = cert.get("not_after")
+    expiry = cert.not_after
+    if expiry is None:
+        yield Result(state=State.UNKNOWN, summary="No expiry date received")
+        return
 
     yield from check_levels(
         value=(expiry - now).days,
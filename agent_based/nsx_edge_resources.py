@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import (
+    Any,
+    Dict,
+    Mapping,
+    NamedTuple,
+    Optional,
+    TypedDict,
+)
+
+from .agent_based_api.v1 import (
+    check_levels,
+    register,
+    render,
+    Result,
+    Service,
+    State,
+)
+
+from .agent_based_api.v1.type_defs import (
+    StringTable,
+    CheckResult,
+    DiscoveryResult,
+)
+
+from .nsx_lb_counters import (
+    _render_per_second,
+    check_counter_rates,
+)
+
+
+class EdgeCpu(NamedTuple):
+    datapath_avg: Optional[float]
+    datapath_max: Optional[float]
+    service_avg: Optional[float]
+    service_max: Optional[float]
+
+
+class EdgeMem(NamedTuple):
+    total: Optional[int]
+    used: Optional[int]
+    cache: Optional[int]
+    datapath_usage: Optional[float]
+
+
+class EdgeDisk(NamedTuple):
+    total: Optional[int]
+    used: Optional[int]
+
+
+class EdgeUplink(NamedTuple):
+    timestamp: float
+    rx_bytes: int
+    tx_bytes: int
+    rx_packets: int
+    tx_packets: int
+    rx_dropped: int
+    tx_dropped: int
+
+
+class EdgeResources(TypedDict, total=False):
+    cpu: EdgeCpu
+    mem: EdgeMem
+    disk: EdgeDisk
+    uplinks: Dict[str, EdgeUplink]
+
+
+Section = Dict[str, EdgeResources]
+
+
+def _float(value: str) -> Optional[float]:
+    return float(value) if value else None
+
+
+def _kbytes(value: str) -> Optional[int]:
+    # Memory and disk space are sent in kB
+    return int(value) * 1024 if value else None
+
+
+def parse_nsx_edge_resources(string_table: StringTable) -> Section:
+    parsed: Section = {}
+    for line in string_table:
+        # Checkmk strips empty trailing fields, e.g. of a missing value
+        line = line + [""] * (10 - len(line))
+        edge = parsed.setdefault(line[0], EdgeResources())
+        if line[1] == "cpu":
+            edge["cpu"] = EdgeCpu(*(_float(v) for v in line[2:6]))
+        elif line[1] == "mem":
+            edge["mem"] = EdgeMem(
+                _kbytes(line[2]), _kbytes(line[3]), _kbytes(line[4]), _float(line[5])
+            )
+        elif line[1] == "disk":
+            edge["disk"] = EdgeDisk(_kbytes(line[2]), _kbytes(line[3]))
+        elif line[1] == "uplink" and line[3]:
+            edge.setdefault("uplinks", {})[line[2]] = EdgeUplink(
+                int(line[3]) / 1000, *(int(v) if v else 0 for v in line[4:10])
+            )
+    return parsed
+
+
+register.agent_section(
+    name="nsx_edge_resources",
+    parse_function=parse_nsx_edge_resources,
+)
+
+
+def discover_nsx_edge_resources(section: Section) -> DiscoveryResult:
+    for item, edge in section.items():
+        if "cpu" in edge or "mem" in edge or "disk" in edge:
+            yield Service(item=item)
+
+
+def _check_cpu(params: Mapping[str, Any], cpu: EdgeCpu) -> CheckResult:
+    # The datapath runs on dedicated (DPDK) cores, the remaining cores run
+    # the other services of the edge.
+    for avg, highest, levels_key, label in [
+        (cpu.datapath_avg, cpu.datapath_max, "datapath_cpu", "Datapath CPU"),
+        (cpu.service_avg, cpu.service_max, "service_cpu", "Service CPU"),
+    ]:
+        metric_name = f"nsx_edge_{levels_key}"
+        if avg is not None:
+            yield from check_levels(
+                value=avg,
+                levels_upper=params.get(levels_key),
+                metric_name=metric_name,
+                render_func=render.percent,
+                label=label,
+                boundaries=(0, 100),
+            )
+        if highest is not None:
+            yield from check_levels(
+                value=highest,
+                metric_name=f"{metric_name}_max",
+                render_func=render.percent,
+                label=f"{label} busiest core",
+                boundaries=(0, 100),
+                notice_only=True,
+            )
+
+
+def _check_mem(params: Mapping[str, Any], mem: EdgeMem) -> CheckResult:
+    if mem.total and mem.used is not None:
+        yield from check_levels(
+            value=100.0 * mem.used / mem.total,
+            levels_upper=params.get("memory"),
+            metric_name="nsx_edge_mem_usage",
+            render_func=render.percent,
+            label="Memory",
+            boundaries=(0, 100),
+        )
+        yield Result(
+            state=State.OK,
+            notice="Memory used: %s of %s"
+            % (render.bytes(mem.used), render.bytes(mem.total)),
+        )
+    if mem.datapath_usage is not None:
+        yield from check_levels(
+            value=mem.datapath_usage,
+            levels_upper=params.get("datapath_memory"),
+            metric_name="nsx_edge_datapath_mem_usage",
+            render_func=render.percent,
+            label="Datapath memory",
+            boundaries=(0, 100),
+        )
+
+
+def _check_disk(params: Mapping[str, Any], disk: EdgeDisk) -> CheckResult:
+    if not disk.total or disk.used is None:
+        return
+    yield from check_levels(
+        value=100.0 * disk.used / disk.total,
+        levels_upper=params.get("disk"),
+        metric_name="nsx_edge_disk_usage",
+        render_func=render.percent,
+        label="Disk",
+        boundaries=(0, 100),
+    )
+    yield Result(
+        state=State.OK,
+        notice="Disk used: %s of %s"
+        % (render.disksize(disk.used), render.disksize(disk.total)),
+    )
+
+
+def check_nsx_edge_resources(
+    item: str, params: Mapping[str, Any], section: Section
+) -> CheckResult:
+    edge = section.get(item)
+    if edge is None:
+        return
+
+    if "cpu" in edge:
+        yield from _check_cpu(params, edge["cpu"])
+    if "mem" in edge:
+        yield from _check_mem(params, edge["mem"])
+    if "disk" in edge:
+        yield from _check_disk(params, edge["disk"])
+
+
+def cluster_check_nsx_edge_resources(
+    item: str, params: Mapping[str, Any], section: Mapping[str, Optional[Section]]
+) -> CheckResult:
+    yield Result(state=State.OK, summary="Nodes: %s" % ", ".join(section.keys()))
+    for node_section in section.values():
+        if node_section and item in node_section:
+            yield from check_nsx_edge_resources(item, params, node_section)
+            return
+
+
+register.check_plugin(
+    name="nsx_edge_resources",
+    service_name="NSX Edge Resources %s",
+    discovery_function=discover_nsx_edge_resources,
+    check_function=check_nsx_edge_resources,
+    check_ruleset_name="nsx_edge_resources",
+    check_default_parameters={
+        "datapath_cpu": (80.0, 90.0),
+        "service_cpu": (80.0, 90.0),
+        "memory": (80.0, 90.0),
+        "datapath_memory": (80.0, 90.0),
+        "disk": (80.0, 90.0),
+    },
+    cluster_check_function=cluster_check_nsx_edge_resources,
+)
+
+
+def discover_nsx_edge_uplinks(section: Section) -> DiscoveryResult:
+    for name, edge in section.items():
+        for interface in edge.get("uplinks", {}):
+            yield Service(item=f"{name} {interface}")
+
+
+# Counter, label, metric name, render function, key of the levels
+_UPLINK_RATES = [
+    ("rx_bytes", "In", "nsx_edge_uplink_in", render.iobandwidth, "bandwidth_in"),
+    ("tx_bytes", "Out", "nsx_edge_uplink_out", render.iobandwidth, "bandwidth_out"),
+    (
+        "rx_packets",
+        "Packets in",
+        "nsx_edge_uplink_packets_in",
+        _render_per_second,
+        None,
+    ),
+    (
+        "tx_packets",
+        "Packets out",
+        "nsx_edge_uplink_packets_out",
+        _render_per_second,
+        None,
+    ),
+    (
+        "rx_dropped",
+        "Dropped in",
+        "nsx_edge_uplink_drops_in",
+        _render_per_second,
+        "drops",
+    ),
+    (
+        "tx_dropped",
+        "Dropped out",
+        "nsx_edge_uplink_drops_out",
+        _render_per_second,
+        "drops",
+    ),
+]
+
+
+def check_nsx_edge_uplinks(
+    item: str, params: Mapping[str, Any], section: Section
+) -> CheckResult:
+    name, _sep, interface = item.rpartition(" ")
+    uplink = section.get(name, {}).get("uplinks", {}).get(interface)
+    if uplink is None:
+        return
+
+    results = list(check_counter_rates(params, uplink, _UPLINK_RATES))
+    yield from results
+    if not results:
+        yield Result(state=State.OK, summary="Initializing counters")
+
+
+register.check_plugin(
+    name="nsx_edge_uplinks",
+    sections=["nsx_edge_resources"],
+    service_name="NSX Edge Uplink %s",
+    discovery_function=discover_nsx_edge_uplinks,
+    check_function=check_nsx_edge_uplinks,
+    check_ruleset_name="nsx_edge_uplinks",
+    check_default_parameters={},
+)
@@ -4,8 +4,8 @@
 from typing import (
     Dict,
     Mapping,
+    NamedTuple,
     Optional,
-    TypedDict,
 )
 
 from .agent_based_api.v1 import (
@@ -24,10 +24,9 @@ from .agent_based_api.v1.type_defs import (
 import json
 
 
-class EdgeData(TypedDict, total=False):
+class EdgeData(NamedTuple):
     id: str
     status: str
-    display_name: str
 
 
 Section = Dict[str, EdgeData]
@@ -39,22 +38,29 @@ _STATUS_MAP = {
 }
 
 
-def parse_nsx_edges(string_table: StringTable) -> Section:
+def _parse_nsx_edges_json(line: str) -> Section:
+    # First version of the section: all edges as one JSON array
     parsed: Section = {}
-    for edge in json.loads(string_table[0][0]) or []:
-        result = EdgeData()
-        if "node_uuid" in edge:
-            result["id"] = str(edge["node_uuid"])
-        if "status" in edge:
-            result["status"] = str(edge["status"])
-        if "node_display_name" in edge:
-            result["display_name"] = str(edge["node_display_name"])
-
-        if "display_name" not in result:
+    for edge in json.loads(line) or []:
+        if "node_display_name" not in edge:
             continue
+        parsed.setdefault(
+            str(edge["node_display_name"]),
+            EdgeData(str(edge.get("node_uuid", "")), str(edge.get("status", ""))),
+        )
+    return parsed
 
-        parsed.setdefault(result["display_name"], result)
 
+def parse_nsx_edges(string_table: StringTable) -> Section:
+    if string_table and string_table[0][0].startswith("["):
+        return _parse_nsx_edges_json(string_table[0][0])
+
+    parsed: Section = {}
+    for row in string_table:
+        # Checkmk strips empty trailing fields, e.g. of an edge without status
+        node_uuid, name, status = (row + [""] * 3)[:3]
+        if name and name not in parsed:
+            parsed[name] = EdgeData(node_uuid, status)
     return parsed
 
 
@@ -74,11 +80,10 @@ def check_nsx_edges(item: str, section: Section) -> CheckResult:
         return
 
     edge = section[item]
-    edge_state = _STATUS_MAP.get(
-        edge["status"], (3, "unknown[%s]" % edge["status"]))
-    yield Result(state=edge_state, summary=f"is {edge['status']}")
+    edge_state = _STATUS_MAP.get(edge.status, State.UNKNOWN)
+    yield Result(state=edge_state, summary=f"is {edge.status}")
 
-    yield Result(state=State.OK, summary=f"ID: {edge['id']}")
+    yield Result(state=State.OK, summary=f"ID: {edge.id}")
 
 
 def cluster_check_nsx_edges(item: str, section: Mapping[str, Optional[Section]]) -> CheckResult:
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import (
+    Any,
+    Mapping,
+    NamedTuple,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .agent_based_api.v1 import (
+    check_levels,
+    get_rate,
+    get_value_store,
+    GetRateError,
+    render,
+)
+
+from .agent_based_api.v1.type_defs import (
+    CheckResult,
+)
+
+
+class LbCounters(NamedTuple):
+    timestamp: float
+    bytes_in: int
+    bytes_out: int
+    packets_in: int
+    packets_out: int
+    current_sessions: int
+    total_sessions: int
+
+
+def _render_per_second(value: float) -> str:
+    return "%.1f/s" % value
+
+
+# Counter, label, metric name, render function, key of the levels
+_RATES = [
+    ("bytes_in", "In", "nsx_lb_bytes_in", render.iobandwidth, "bytes_in"),
+    ("bytes_out", "Out", "nsx_lb_bytes_out", render.iobandwidth, "bytes_out"),
+    (
+        "packets_in",
+        "Packets in",
+        "nsx_lb_packets_in",
+        _render_per_second,
+        "packets_in",
+    ),
+    (
+        "packets_out",
+        "Packets out",
+        "nsx_lb_packets_out",
+        _render_per_second,
+        "packets_out",
+    ),
+    (
+        "total_sessions",
+        "New sessions",
+        "nsx_lb_session_rate",
+        _render_per_second,
+        "session_rate",
+    ),
+]
+
+
+def parse_lb_counters(fields: Sequence[str]) -> Optional[LbCounters]:
+    """Parse the statistics fields sent by agent_nsx after an object
+
+    The fields start with the update time in ms, they are missing for
+    agents not sending statistics and for objects without statistics."""
+    if len(fields) < 7 or not fields[0]:
+        return None
+    return LbCounters(
+        int(fields[0]) / 1000,
+        int(fields[1]),
+        int(fields[2]),
+        int(fields[3]),
+        int(fields[4]),
+        int(fields[5]),
+        int(fields[6]),
+    )
+
+
+def split_lb_counters(
+    line: List[str], fields: int
+) -> Tuple[List[str], Optional[LbCounters]]:
+    """Split the statistics fields from the end of a line
+
+    fields is the number of fields in front of them. Reading the statistics
+    from the end keeps a separator in a name sent by older agents from
+    shifting them."""
+    if len(line) >= fields + 7 and all(v.isdigit() for v in line[-7:]):
+        return line[:-7], parse_lb_counters(line[-7:])
+    return line, None
+
+
+def check_lb_counters(params: Mapping[str, Any], counters: LbCounters) -> CheckResult:
+    yield from check_levels(
+        value=counters.current_sessions,
+        levels_upper=params.get("current_sessions"),
+        metric_name="nsx_lb_current_sessions",
+        render_func=lambda v: "%d" % v,
+        label="Current sessions",
+    )
+
+    yield from check_counter_rates(params, counters, _RATES)
+
+
+def check_counter_rates(
+    params: Mapping[str, Any], counters: Any, rates: Sequence[Tuple]
+) -> CheckResult:
+    """Check the rates of the counters, see _RATES for the format of rates
+
+    Rates are computed over the timestamp of the counters, a cached section
+    sent again does not produce a rate."""
+    value_store = get_value_store()
+    for counter, label, metric_name, render_func, levels_key in rates:
+        try:
+            rate = get_rate(
+                value_store,
+                counter,
+                counters.timestamp,
+                getattr(counters, counter),
+                raise_overflow=True,
+            )
+        except GetRateError:
+            continue
+        yield from check_levels(
+            value=rate,
+            levels_upper=params.get(levels_key),
+            metric_name=metric_name,
+            render_func=render_func,
+            label=label,
+        )
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 from typing import (
+    Any,
     Dict,
     Mapping,
     Optional,
@@ -20,7 +21,12 @@ from .agent_based_api.v1.type_defs import (
     DiscoveryResult,
 )
 
-SECTION = Dict[str, Dict[str, str]]
+from .nsx_lb_counters import (
+    check_lb_counters,
+    split_lb_counters,
+)
+
+SECTION = Dict[str, Dict[str, Any]]
 
 _ENABLED_MAP = {
     "True": (State.OK, "enabled"),
@@ -38,12 +44,14 @@ def parse_nsx_loadbalancer(string_table: StringTable) -> SECTION:
     parsed: SECTION = {}
 
     for line in string_table:
+        fields, counters = split_lb_counters(line, 4)
         parsed.setdefault(
-            line[0],
+            ";".join(fields[:-3]),
             {
-                "id": line[1],
-                "status": line[2],
-                "enabled": line[3],
+                "id": fields[-3],
+                "status": fields[-2],
+                "enabled": fields[-1],
+                "counters": counters,
             },
         )
 
@@ -61,7 +69,9 @@ def discover_nsx_loadbalancer(section: SECTION) -> DiscoveryResult:
         yield Service(item=item)
 
 
-def check_nsx_loadbalancer(item: str, section: SECTION) -> CheckResult:
+def check_nsx_loadbalancer(
+    item: str, params: Mapping[str, Any], section: SECTION
+) -> CheckResult:
     if item not in section:
         return
 
@@ -79,16 +89,17 @@ def check_nsx_loadbalancer(item: str, section: SECTION) -> CheckResult:
 
     yield Result(state=State.OK, summary=f"ID: {loadbalancer['id']}")
 
-    # TODO perfdata
+    if loadbalancer["counters"] is not None:
+        yield from check_lb_counters(params, loadbalancer["counters"])
 
 
 def cluster_check_nsx_loadbalancer(
-    item: str, section: Mapping[str, Optional[SECTION]]
+    item: str, params: Mapping[str, Any], section: Mapping[str, Optional[SECTION]]
 ) -> CheckResult:
     yield Result(state=State.OK, summary='Nodes: %s' % ', '.join(section.keys()))
     for node_section in section.values():
         if item in node_section:
-            yield from check_nsx_loadbalancer(item, node_section)
+            yield from check_nsx_loadbalancer(item, params, node_section)
             return
 
 
@@ -97,5 +108,7 @@ register.check_plugin(
     service_name="NSX LoadBalancer %s",
     discovery_function=discover_nsx_loadbalancer,
     check_function=check_nsx_loadbalancer,
+    check_ruleset_name="nsx_loadbalancer",
+    check_default_parameters={},
     cluster_check_function=cluster_check_nsx_loadbalancer,
 )
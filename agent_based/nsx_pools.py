@@ -2,13 +2,17 @@
 # -*- coding: utf-8 -*-
 
 from typing import (
+    Any,
     Dict,
     Mapping,
+    NamedTuple,
     Optional,
 )
 
 from .agent_based_api.v1 import (
+    check_levels,
     register,
+    render,
     Service,
     Result,
     State,
@@ -20,9 +24,31 @@ from .agent_based_api.v1.type_defs import (
     DiscoveryResult,
 )
 
+from .nsx_lb_counters import (
+    check_lb_counters,
+    LbCounters,
+    parse_lb_counters,
+)
+
 import json
 
-Section = Dict[str, Dict[str, str]]
+
+class MemberCounts(NamedTuple):
+    total: int
+    up: int
+    down: int
+    disabled: int
+    graceful: int
+
+
+class PoolData(NamedTuple):
+    pool_id: str
+    status: str
+    members: Optional[MemberCounts] = None
+    counters: Optional[LbCounters] = None
+
+
+Section = Dict[str, PoolData]
 
 _ENABLED_MAP = {
     "True": (State.OK, "enabled"),
@@ -37,12 +63,33 @@ _STATUS_MAP = {
 }
 
 
-def parse_nsx_pools(string_table: StringTable) -> Section:
+def _parse_nsx_pools_json(line: str) -> Section:
+    # First version of the section: all pools as one JSON array
     parsed: Section = {}
+    for pool in json.loads(line) or []:
+        parsed.setdefault(
+            pool["display_name"], PoolData(pool["pool_id"], pool["status"])
+        )
+    return parsed
 
-    for pool in json.loads(string_table[0][0]) or []:
-        parsed.setdefault(pool["display_name"], pool)
 
+def parse_nsx_pools(string_table: StringTable) -> Section:
+    if string_table and string_table[0][0].startswith("["):
+        # The first version was sent with sep(59)
+        return _parse_nsx_pools_json(";".join(string_table[0]))
+
+    parsed: Section = {}
+    for row in string_table:
+        # Checkmk strips empty trailing fields, e.g. of a pool without status
+        row = row + [""] * (3 - len(row))
+        # Pools shared by several services are sent once for every service
+        if row[1] not in parsed:
+            parsed[row[1]] = PoolData(
+                row[0],
+                row[2],
+                MemberCounts(*map(int, row[3:8])) if len(row) >= 8 else None,
+                parse_lb_counters(row[8:]),
+            )
     return parsed
 
 
@@ -51,25 +98,53 @@ def discover_nsx_pools(section: Section) -> DiscoveryResult:
         yield Service(item=item)
 
 
-def check_nsx_pools(item: str, section: Section) -> CheckResult:
+def check_nsx_pools(
+    item: str, params: Mapping[str, Any], section: Section
+) -> CheckResult:
     if item not in section:
         return
 
     pool = section[item]
 
     yield Result(
-        state=_STATUS_MAP.get(pool["status"], State.UNKNOWN),
-        summary=f"State: {pool['status']}",
+        state=_STATUS_MAP.get(pool.status, State.UNKNOWN),
+        summary=f"State: {pool.status}",
     )
 
-    yield Result(state=State.OK, summary=f"ID: {pool['pool_id']}")
-
-
-def cluster_check_nsx_pools(item: str, section: Mapping[str, Optional[Section]]) -> CheckResult:
+    yield Result(state=State.OK, summary=f"ID: {pool.pool_id}")
+
+    members = pool.members
+    if members is not None:
+        yield Result(
+            state=State.OK,
+            summary=(
+                f"Members: {members.up} up, {members.down} down, "
+                f"{members.disabled} disabled, {members.graceful} graceful disabled"
+            ),
+        )
+        # Members disabled on purpose do not count as missing
+        enabled = members.total - members.disabled - members.graceful
+        if enabled > 0:
+            yield from check_levels(
+                value=100.0 * members.up / enabled,
+                levels_lower=params.get("members_up"),
+                metric_name="nsx_pool_members_up_perc",
+                render_func=render.percent,
+                label="Enabled members up",
+                boundaries=(0, 100),
+            )
+
+    if pool.counters is not None:
+        yield from check_lb_counters(params, pool.counters)
+
+
+def cluster_check_nsx_pools(
+    item: str, params: Mapping[str, Any], section: Mapping[str, Optional[Section]]
+) -> CheckResult:
     yield Result(state=State.OK, summary='Nodes: %s' % ', '.join(section.keys()))
     for node_section in section.values():
         if item in node_section:
-            yield from check_nsx_pools(item, node_section)
+            yield from check_nsx_pools(item, params, node_section)
             return
 
 
@@ -83,5 +158,7 @@ register.check_plugin(
     service_name="NSX Pool %s",
     discovery_function=discover_nsx_pools,
     check_function=check_nsx_pools,
+    check_ruleset_name="nsx_pools",
+    check_default_parameters={},
     cluster_check_function=cluster_check_nsx_pools,
 )
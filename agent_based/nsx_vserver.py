@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 from typing import (
+    Any,
     Dict,
     Mapping,
     Optional,
@@ -20,7 +21,12 @@ from .agent_based_api.v1.type_defs import (
     DiscoveryResult,
 )
 
-SECTION = Dict[str, Dict[str, str]]
+from .nsx_lb_counters import (
+    check_lb_counters,
+    split_lb_counters,
+)
+
+SECTION = Dict[str, Dict[str, Any]]
 
 _ENABLED_MAP = {
     "True": (State.OK, "enabled"),
@@ -39,12 +45,14 @@ def parse_nsx_vservers(string_table: StringTable) -> SECTION:
     parsed: SECTION = {}
 
     for line in string_table:
+        fields, counters = split_lb_counters(line, 4)
         parsed.setdefault(
-            line[3],
+            ";".join(fields[3:]),
             {
-                "id": line[0],
-                "status": line[1],
-                "enabled": line[2],
+                "id": fields[0],
+                "status": fields[1],
+                "enabled": fields[2],
+                "counters": counters,
             },
         )
 
@@ -56,7 +64,9 @@ def discover_nsx_vservers(section: SECTION) -> DiscoveryResult:
         yield Service(item=item)
 
 
-def check_nsx_vservers(item: str, section: SECTION) -> CheckResult:
+def check_nsx_vservers(
+    item: str, params: Mapping[str, Any], section: SECTION
+) -> CheckResult:
     if item not in section:
         return
 
@@ -73,14 +83,17 @@ def check_nsx_vservers(item: str, section: SECTION) -> CheckResult:
 
     yield Result(state=State.OK, summary=f"ID: {vserver['id']}")
 
+    if vserver["counters"] is not None:
+        yield from check_lb_counters(params, vserver["counters"])
+
 
 def cluster_check_nsx_vservers(
-    item: str, section: Mapping[str, Optional[SECTION]]
+    item: str, params: Mapping[str, Any], section: Mapping[str, Optional[SECTION]]
 ) -> CheckResult:
     yield Result(state=State.OK, summary="Nodes: %s" % ", ".join(section.keys()))
     for node_section in section.values():
         if item in node_section:
-            yield from check_nsx_vservers(item, node_section)
+            yield from check_nsx_vservers(item, params, node_section)
             return
 
 
@@ -94,5 +107,7 @@ register.check_plugin(
     service_name="NSX Virtual Server %s",
     discovery_function=discover_nsx_vservers,
     check_function=check_nsx_vservers,
+    check_ruleset_name="nsx_vservers",
+    check_default_parameters={},
     cluster_check_function=cluster_check_nsx_vservers,
 )
@@ -0,0 +1,670 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+"""Local mock of the NSX-T Manager API used by agent_nsx
+
+Serves a synthetic inventory of arbitrary size over HTTPS. The list
+endpoints support cursor pagination and included_fields, all responses
+carry an ETag and honour If-None-Match. Optional per-request latency and
+a request rate / concurrency limit answering 429 with Retry-After allow
+to benchmark agent_nsx under realistic conditions.
+
+USAGE: mock_nsx.py [OPTIONS]
+
+Run with --help for the options. The benchmark suite run_benchmarks.py
+starts the server in-process.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import ssl
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_PAGE_SIZE = 1000
+
+
+def generate_inventory(
+    edges=4,
+    lb_services=2,
+    vservers=3,
+    pools=2,
+    members=4,
+    certificates=10,
+    seed=0,
+):
+    """Build a synthetic NSX inventory
+
+    vservers and pools are per LB service, members per pool."""
+    rnd = random.Random(seed)
+    now_ms = int(time.time() * 1000)
+    inventory = {
+        "edges": [],
+        "lb_services": [],
+        "vservers": {},
+        "pools": {},
+        "certificates": [],
+        # API addresses ("ip:port") returned by /api/v1/cluster/nodes
+        "cluster_nodes": [],
+    }
+
+    for i in range(edges):
+        inventory["edges"].append(
+            {
+                "id": "edge-%04d" % i,
+                "display_name": "edge%04d" % i,
+                "resource_type": "TransportNode",
+                "node_deployment_info": {"resource_type": "EdgeNode"},
+                "status": rnd.choice(["UP"] * 8 + ["DEGRADED", "DOWN"]),
+            }
+        )
+
+    for s in range(lb_services):
+        service = {
+            "id": "lb-%04d" % s,
+            "display_name": "lb-service-%04d" % s,
+            "enabled": True,
+            "virtual_servers": [],
+            "pools": [],
+        }
+        for p in range(pools):
+            pool_id = "pool-%04d-%04d" % (s, p)
+            inventory["pools"][pool_id] = {
+                "id": pool_id,
+                "display_name": "pool-%04d-%04d" % (s, p),
+                "resource_type": "LbPool",
+                "algorithm": "ROUND_ROBIN",
+                "members": [
+                    {
+                        "ip_address": "10.%d.%d.%d" % (s % 256, p % 256, m % 256),
+                        "port": "443",
+                        "admin_state": rnd.choice(["ENABLED"] * 9 + ["DISABLED"]),
+                    }
+                    for m in range(members)
+                ],
+            }
+            service["pools"].append(pool_id)
+        for v in range(vservers):
+            vserver_id = "vs-%04d-%04d" % (s, v)
+            inventory["vservers"][vserver_id] = {
+                "id": vserver_id,
+                "display_name": "vserver-%04d-%04d" % (s, v),
+                "resource_type": "LbVirtualServer",
+                "enabled": rnd.random() > 0.05,
+                "ip_address": "192.168.%d.%d" % (s % 256, v % 256),
+                "pool_id": service["pools"][v % pools] if pools else None,
+            }
+            service["virtual_servers"].append(vserver_id)
+        inventory["lb_services"].append(service)
+
+    for c in range(certificates):
+        inventory["certificates"].append(
+            {
+                "id": "cert-%05d" % c,
+                "display_name": "certificate-%05d" % c,
+                "resource_type": "certificate_self_signed",
+                "pem_encoded": "-----BEGIN CERTIFICATE-----\n%s\n"
+                "-----END CERTIFICATE-----\n" % ("A" * 1600),
+                "_revision": 0,
+                "details": [
+                    {
+                        "not_after": now_ms + rnd.randint(-10, 400) * 86400000,
+                        "not_before": now_ms - 365 * 86400000,
+                        "subject_cn": "host%05d.example.com" % c,
+                        "issuer_cn": "Example CA",
+                        "version": "3",
+                        "serial_number": "%032x" % rnd.getrandbits(128),
+                        "signature_algorithm": "SHA256WITHRSA",
+                        "signature": "%0512x" % rnd.getrandbits(2048),
+                        "public_key_algo": "RSA",
+                        "public_key_length": 2048,
+                        "rsa_public_key_modulus": "%0512x" % rnd.getrandbits(2048),
+                        "rsa_public_key_exponent": "65537",
+                        "is_ca": False,
+                    }
+                ],
+            }
+        )
+
+    return inventory
+
+
+class MockNSXServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        inventory,
+        certfile,
+        keyfile,
+        latency=0.0,
+        rate_limit=0.0,
+        concurrency_limit=0,
+    ):
+        super().__init__(address, MockNSXHandler)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(certfile, keyfile)
+        self.socket = context.wrap_socket(self.socket, server_side=True)
+        self.inventory = inventory
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.concurrency_limit = concurrency_limit
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.tokens = max(1.0, rate_limit)
+        self.updated = time.monotonic()
+        self.counters = {}
+
+    def count(self, key):
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + 1
+
+    def reset_counters(self):
+        with self.lock:
+            self.counters = {}
+
+    def admit(self):
+        """Apply the rate and concurrency limits, False means 429"""
+        with self.lock:
+            now = time.monotonic()
+            if self.rate_limit:
+                self.tokens = min(
+                    max(1.0, self.rate_limit),
+                    self.tokens + (now - self.updated) * self.rate_limit,
+                )
+                self.updated = now
+                if self.tokens < 1:
+                    return False
+            if self.concurrency_limit and self.in_flight >= self.concurrency_limit:
+                return False
+            if self.rate_limit:
+                self.tokens -= 1
+            self.in_flight += 1
+            return True
+
+    def done(self):
+        with self.lock:
+            self.in_flight -= 1
+
+
+def project(obj, fields):
+    if fields is None:
+        return obj
+    return {key: obj[key] for key in fields if key in obj}
+
+
+def paged(objects, params):
+    """Return one page of a list result as the NSX Manager does"""
+    start = int(params.get("cursor", "0") or 0)
+    page_size = int(params.get("page_size", DEFAULT_PAGE_SIZE))
+    fields = None
+    if "included_fields" in params:
+        fields = params["included_fields"].split(",")
+    page = {
+        "result_count": len(objects),
+        "results": [project(obj, fields) for obj in objects[start:start + page_size]],
+    }
+    if start + page_size < len(objects):
+        page["cursor"] = "%08d" % (start + page_size)
+    return page
+
+
+def edge_status(edge):
+    return {
+        "node_uuid": edge["id"],
+        "node_display_name": edge["display_name"],
+        "status": edge["status"],
+        "mgmt_connection_status": "UP",
+        "control_connection_status": {"status": "UP", "up_count": 3},
+        "pnic_status": {"status": "UP", "up_count": 4},
+        "tunnel_status": {"status": "UP", "up_count": 12},
+        "node_status": {
+            "host_node_deployment_status": "NODE_READY",
+            "system_status": {
+                "cpu_cores": 8,
+                "cpu_usage": {
+                    "avg_cpu_core_usage_dpdk": 42.5,
+                    "highest_cpu_core_usage_dpdk": 61.0,
+                    "avg_cpu_core_usage_non_dpdk": 12.25,
+                    "highest_cpu_core_usage_non_dpdk": 30.0,
+                },
+                "edge_mem_usage": {
+                    "system_mem_usage": 55.0,
+                    "swap_usage": 0.0,
+                    "cache_usage": 10.0,
+                    "datapath_total_usage": 38.5,
+                },
+                "mem_total": 32762580,
+                "mem_used": 18019419,
+                "mem_cache": 3276258,
+                "disk_space_total": 209715200,
+                "disk_space_used": 31457280,
+                "load_average": [0.5, 0.4, 0.3],
+                "uptime": 1234567000,
+            },
+        },
+    }
+
+
+EDGE_UPLINKS = ["fp-eth0", "fp-eth1"]
+
+
+def edge_interfaces(edge):
+    interfaces = ["eth0", "lo"] + EDGE_UPLINKS
+    return {
+        "result_count": len(interfaces),
+        "results": [
+            {"interface_id": name, "link_status": "UP", "admin_status": "UP"}
+            for name in interfaces
+        ],
+    }
+
+
+def edge_interface_stats(edge, interface):
+    rate = (1 + sum(map(ord, edge["id"] + interface)) % 10) * 1000
+    now = time.time()
+    return {
+        "interface_id": interface,
+        "rx_bytes": int(now * rate * 800),
+        "tx_bytes": int(now * rate * 700),
+        "rx_packets": int(now * rate),
+        "tx_packets": int(now * rate * 0.9),
+        "rx_dropped": int(now),
+        "tx_dropped": 0,
+        "rx_errors": 0,
+        "tx_errors": 0,
+        "source": "cached",
+    }
+
+
+def lb_service_status(inventory, service):
+    return {
+        "service_id": service["id"],
+        "service_status": "UP",
+        "virtual_servers": [
+            {"virtual_server_id": vs_id, "status": "UP"}
+            for vs_id in service["virtual_servers"]
+        ],
+        "pools": [
+            {
+                "pool_id": pool_id,
+                "status": "UP",
+                "members": [
+                    {
+                        "ip_address": member["ip_address"],
+                        "port": member["port"],
+                        "status": (
+                            "UP" if member["admin_state"] == "ENABLED" else "DISABLED"
+                        ),
+                    }
+                    for member in inventory["pools"][pool_id]["members"]
+                ],
+            }
+            for pool_id in service["pools"]
+        ],
+    }
+
+
+def lb_counters(rate, now):
+    """Counters growing with rate connections per second since the epoch"""
+    return {
+        "bytes_in": int(now * rate * 2000),
+        "bytes_out": int(now * rate * 12000),
+        "packets_in": int(now * rate * 12),
+        "packets_out": int(now * rate * 14),
+        "current_sessions": int(rate * 3),
+        "total_sessions": int(now * rate),
+    }
+
+
+def lb_service_statistics(inventory, service, index):
+    now = time.time()
+    counters = lb_counters(index + 1, now)
+    current, total = counters["current_sessions"], counters["total_sessions"]
+    return {
+        "service_id": service["id"],
+        "last_update_timestamp": int(now * 1000),
+        "statistics": {
+            "bytes_in": counters["bytes_in"],
+            "bytes_out": counters["bytes_out"],
+            "packets_in": counters["packets_in"],
+            "packets_out": counters["packets_out"],
+            "l4_current_sessions": current // 2,
+            "l7_current_sessions": current - current // 2,
+            "l4_total_sessions": total // 2,
+            "l7_total_sessions": total - total // 2,
+        },
+        "virtual_servers": [
+            {
+                "virtual_server_id": vs_id,
+                "last_update_timestamp": int(now * 1000),
+                "statistics": lb_counters(index + v + 1, now),
+            }
+            for v, vs_id in enumerate(service["virtual_servers"])
+        ],
+        "pools": [
+            {
+                "pool_id": pool_id,
+                "last_update_timestamp": int(now * 1000),
+                "members": [
+                    {
+                        "ip_address": member["ip_address"],
+                        "port": member["port"],
+                        "statistics": lb_counters(m + 1, now),
+                    }
+                    for m, member in enumerate(inventory["pools"][pool_id]["members"])
+                ],
+            }
+            for pool_id in service["pools"]
+        ],
+    }
+
+
+class MockNSXHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, status, body, content_type="application/json", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, obj):
+        body = json.dumps(obj).encode()
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        if self.headers.get("If-None-Match") == etag:
+            self.server.count("not_modified")
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_body(200, body, headers={"ETag": etag})
+
+    def send_error_json(self, status, message):
+        self.send_body(
+            status,
+            json.dumps({"httpStatus": status, "error_message": message}).encode(),
+        )
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        path = urlparse(self.path).path
+        self.server.count("requests")
+        if path == "/api/session/create":
+            self.server.count("logins")
+            self.send_body(
+                200,
+                b"",
+                headers={
+                    "Set-Cookie": "JSESSIONID=mock-session; Path=/; Secure; HttpOnly",
+                    "X-XSRF-TOKEN": "mock-xsrf-token",
+                },
+            )
+        elif path == "/api/session/destroy":
+            self.send_body(200, b"")
+        else:
+            self.send_error_json(404, "Not found")
+
+    def do_GET(self):
+        self.server.count("requests")
+        if not self.server.admit():
+            self.server.count("throttled")
+            self.send_body(
+                429,
+                b"<html><body>Too many requests</body></html>",
+                content_type="text/html",
+                headers={"Retry-After": "1"},
+            )
+            return
+        try:
+            if self.server.latency:
+                time.sleep(self.server.latency)
+            url = urlparse(self.path)
+            params = {key: values[0] for key, values in parse_qs(url.query).items()}
+            result = self.route(url.path, params)
+        finally:
+            self.server.done()
+        if result is None:
+            self.send_error_json(404, "The requested URI could not be found")
+        else:
+            self.send_json(result)
+
+    def route(self, path, params):
+        inventory = self.server.inventory
+        for pattern, handler in ROUTES:
+            match = re.fullmatch(pattern, path)
+            if match:
+                return handler(inventory, params, *match.groups())
+        return None
+
+
+def _get(collection, object_id):
+    return collection.get(object_id)
+
+
+def _find(objects, object_id):
+    for obj in objects:
+        if obj["id"] == object_id:
+            return obj
+    return None
+
+
+def _certificate(inventory, params, cert_id):
+    cert = _find(inventory["certificates"], cert_id)
+    if cert is None or params.get("details") == "true":
+        return cert
+    return {key: value for key, value in cert.items() if key != "details"}
+
+
+def _certificates(inventory, params):
+    certs = inventory["certificates"]
+    if params.get("details") != "true":
+        certs = [
+            {key: value for key, value in cert.items() if key != "details"}
+            for cert in certs
+        ]
+    return paged(certs, params)
+
+
+def _lb_service(inventory, service_id):
+    return _find(inventory["lb_services"], service_id)
+
+
+def _lb_service_status(inventory, params, service_id):
+    service = _lb_service(inventory, service_id)
+    return lb_service_status(inventory, service) if service else None
+
+
+def _lb_service_statistics(inventory, params, service_id):
+    for index, service in enumerate(inventory["lb_services"]):
+        if service["id"] == service_id:
+            return lb_service_statistics(inventory, service, index)
+    return None
+
+
+def _edge_status(inventory, params, edge_id):
+    edge = _find(inventory["edges"], edge_id)
+    return edge_status(edge) if edge else None
+
+
+def _edge_interfaces(inventory, params, edge_id):
+    edge = _find(inventory["edges"], edge_id)
+    return edge_interfaces(edge) if edge else None
+
+
+def _edge_interface_stats(inventory, params, edge_id, interface):
+    edge = _find(inventory["edges"], edge_id)
+    return edge_interface_stats(edge, interface) if edge else None
+
+
+def _cluster_nodes(inventory, params):
+    results = []
+    for i, address in enumerate(inventory["cluster_nodes"]):
+        ip, _sep, port = address.rpartition(":")
+        results.append(
+            {
+                "id": "manager-%d" % i,
+                "display_name": "nsx-manager-%d" % i,
+                "manager_role": {
+                    "type": "ManagementClusterRoleConfig",
+                    "api_listen_addr": {"ip_address": ip, "port": int(port)},
+                },
+            }
+        )
+    return {"results": results, "result_count": len(results)}
+
+
+ROUTES = [
+    (
+        r"/api/v1/transport-nodes",
+        lambda inv, params: paged(
+            [
+                project(
+                    e, ["id", "display_name", "resource_type", "node_deployment_info"]
+                )
+                for e in inv["edges"]
+            ],
+            params,
+        ),
+    ),
+    (r"/api/v1/transport-nodes/([^/]+)/status", _edge_status),
+    (r"/api/v1/transport-nodes/([^/]+)/network/interfaces", _edge_interfaces),
+    (
+        r"/api/v1/transport-nodes/([^/]+)/network/interfaces/([^/]+)/stats",
+        _edge_interface_stats,
+    ),
+    (
+        r"/api/v1/transport-zones/transport-node-status",
+        lambda inv, params: paged([edge_status(e) for e in inv["edges"]], params),
+    ),
+    (
+        r"/api/v1/cluster/backups/history",
+        lambda inv, params: {
+            "cluster_backup_statuses": [
+                {
+                    "backup_id": "cluster-backup",
+                    "start_time": int(time.time() * 1000) - 3600000,
+                    "end_time": int(time.time() * 1000) - 3500000,
+                    "success": True,
+                }
+            ],
+            "node_backup_statuses": [],
+            "inventory_backup_statuses": [],
+        },
+    ),
+    (r"/api/v1/cluster/nodes", _cluster_nodes),
+    (
+        r"/api/v1/node/status",
+        lambda inv, params: {
+            "cpu_cores": 12,
+            "load_average": [0.5, 0.6, 0.7],
+            "mem_total": 49386544,
+            "mem_used": 30386544,
+            "mem_free": 19000000,
+            "mem_cache": 6000000,
+            "mem_buffer": 400000,
+            "swap_total": 0,
+            "swap_used": 0,
+            "uptime": 1234567000,
+        },
+    ),
+    (
+        r"/api/v1/loadbalancer/services",
+        lambda inv, params: paged(
+            [project(s, ["id", "display_name", "enabled"]) for s in inv["lb_services"]],
+            params,
+        ),
+    ),
+    (r"/api/v1/loadbalancer/services/([^/]+)/status", _lb_service_status),
+    (r"/api/v1/loadbalancer/services/([^/]+)/statistics", _lb_service_statistics),
+    (
+        r"/api/v1/loadbalancer/virtual-servers",
+        lambda inv, params: paged(list(inv["vservers"].values()), params),
+    ),
+    (
+        r"/api/v1/loadbalancer/virtual-servers/([^/]+)",
+        lambda inv, params, vs_id: _get(inv["vservers"], vs_id),
+    ),
+    (
+        r"/api/v1/loadbalancer/pools",
+        lambda inv, params: paged(list(inv["pools"].values()), params),
+    ),
+    (
+        r"/api/v1/loadbalancer/pools/([^/]+)",
+        lambda inv, params, pool_id: _get(inv["pools"], pool_id),
+    ),
+    (r"/api/v1/trust-management/certificates", _certificates),
+    (r"/api/v1/trust-management/certificates/([^/]+)", _certificate),
+]
+
+
+def start_server(inventory, certfile, keyfile, port=0, **limits):
+    """Start a mock server in a background thread and return it"""
+    server = MockNSXServer(("127.0.0.1", port), inventory, certfile, keyfile, **limits)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock NSX-T Manager API")
+    parser.add_argument("--port", type=int, default=8443)
+    parser.add_argument("--certfile", required=True)
+    parser.add_argument("--keyfile", required=True)
+    parser.add_argument("--edges", type=int, default=4)
+    parser.add_argument("--lb-services", type=int, default=2)
+    parser.add_argument("--vservers", type=int, default=3, help="per LB service")
+    parser.add_argument("--pools", type=int, default=2, help="per LB service")
+    parser.add_argument("--members", type=int, default=4, help="per pool")
+    parser.add_argument("--certificates", type=int, default=10)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds per request"
+    )
+    parser.add_argument(
+        "--rate-limit", type=float, default=0.0, help="requests/s, 0 = off"
+    )
+    parser.add_argument("--concurrency-limit", type=int, default=0, help="0 = off")
+    parser.add_argument(
+        "--cluster-node",
+        action="append",
+        default=[],
+        help="IP:PORT returned by /api/v1/cluster/nodes, may be given multiple times",
+    )
+    args = parser.parse_args()
+
+    inventory = generate_inventory(
+        edges=args.edges,
+        lb_services=args.lb_services,
+        vservers=args.vservers,
+        pools=args.pools,
+        members=args.members,
+        certificates=args.certificates,
+    )
+    inventory["cluster_nodes"] = args.cluster_node
+    server = MockNSXServer(
+        ("127.0.0.1", args.port),
+        inventory,
+        args.certfile,
+        args.keyfile,
+        latency=args.latency,
+        rate_limit=args.rate_limit,
+        concurrency_limit=args.concurrency_limit,
+    )
+    print("Mock NSX Manager listening on https://127.0.0.1:%d" % args.port)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
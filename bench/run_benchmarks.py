@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+"""Scale benchmarks for agent_nsx and the NSX section parsers
+
+Every scenario starts the mock NSX Manager from mock_nsx.py with a
+synthetic inventory, runs agent_nsx against it and measures wall time,
+number of API requests and peak RSS of the agent. The agent output is then
+fed to parse_nsx_pools, parse_nsx_certificates, parse_nsx_edges and
+parse_nsx_backups to measure their throughput.
+
+The parsers import the Checkmk plugin API, so their benchmarks only run
+inside a Checkmk site (e.g. after "omd su SITE"), they are skipped
+elsewhere. Results are compared against the limits in thresholds.json,
+the exit code is 1 if any of them is exceeded.
+
+USAGE: run_benchmarks.py [--scenario NAME ...] [--thresholds FILE] [--json]
+"""
+
+import argparse
+import importlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import mock_nsx
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+AGENT = os.path.join(BENCH_DIR, "..", "agents", "special", "agent_nsx")
+
+LARGE = {
+    "edges": 60,
+    "lb_services": 50,
+    "vservers": 6,
+    "pools": 20,
+    "members": 8,
+    "certificates": 400,
+}
+
+# Inventory sizes and mock server options of the benchmark scenarios
+SCENARIOS = {
+    "small": {
+        "inventory": {
+            "edges": 4,
+            "lb_services": 2,
+            "vservers": 3,
+            "pools": 2,
+            "members": 4,
+            "certificates": 10,
+        },
+        "server": {},
+    },
+    "large": {
+        "inventory": LARGE,
+        "server": {},
+    },
+    "huge": {
+        "inventory": {
+            "edges": 100,
+            "lb_services": 100,
+            "vservers": 10,
+            "pools": 50,
+            "members": 10,
+            "certificates": 1000,
+        },
+        "server": {},
+    },
+    "throttled": {
+        "inventory": LARGE,
+        "server": {"latency": 0.02, "rate_limit": 30, "concurrency_limit": 2},
+    },
+    # Manager cluster of three nodes discovered by the agent, plus one node
+    # refusing connections which the agent has to fail over from
+    "cluster": {
+        "inventory": LARGE,
+        "server": {"latency": 0.005},
+        "nodes": 3,
+        "dead_nodes": 1,
+    },
+}
+
+PARSERS = [
+    ("nsx_pools", "nsx_pools", "parse_nsx_pools"),
+    ("nsx_certificates", "nsx_certificates", "parse_nsx_certificates"),
+    ("nsx_edges", "nsx_edges", "parse_nsx_edges"),
+    ("nsx_backups", "nsx_backups", "parse_nsx_backups"),
+]
+
+
+def create_certificate(directory):
+    certfile = os.path.join(directory, "cert.pem")
+    keyfile = os.path.join(directory, "key.pem")
+    subprocess.run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-days",
+            "1",
+            "-subj",
+            "/CN=localhost",
+            "-keyout",
+            keyfile,
+            "-out",
+            certfile,
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return certfile, keyfile
+
+
+def unused_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def run_agent(port, extra_args, env):
+    """Run agent_nsx and return its output, wall time and peak RSS in KiB"""
+    command = [
+        sys.executable,
+        AGENT,
+        "--address",
+        "127.0.0.1:%d" % port,
+        "--username",
+        "admin",
+        "--password",
+        "secret",
+        "--no-cert-check",
+    ] + extra_args
+    started = time.monotonic()
+    proc = subprocess.Popen(
+        command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env
+    )
+    # Both pipes are drained at once, the agent blocks when either of them
+    # fills up. The process is reaped with wait4() instead of communicate(),
+    # RUSAGE_CHILDREN would report the peak RSS of all scenarios so far.
+    stderr = []
+    reader = threading.Thread(target=lambda: stderr.append(proc.stderr.read()))
+    reader.start()
+    stdout = proc.stdout.read()
+    reader.join()
+    stderr = stderr[0]
+    _pid, status, rusage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    wall_time = time.monotonic() - started
+    if proc.returncode != 0:
+        raise RuntimeError("agent_nsx failed: %s" % stderr.decode(errors="replace"))
+    return stdout.decode(), wall_time, rusage.ru_maxrss
+
+
+def split_sections(agent_output):
+    """Split agent output into string tables like the Checkmk fetcher"""
+    sections = {}
+    current = None
+    for line in agent_output.splitlines():
+        if line.startswith("<<<") and not line.startswith("<<<<"):
+            name, *options = line[3:-3].split(":")
+            sep = None
+            for option in options:
+                if option.startswith("sep("):
+                    sep = chr(int(option[4:-1]))
+            current = (sep, sections.setdefault(name, []))
+            continue
+        if current is not None and line:
+            sep, table = current
+            table.append(line.split(sep) if sep else line.split())
+    return sections
+
+
+def load_parsers():
+    try:
+        package = importlib.import_module("cmk.base.plugins.agent_based")
+    except ImportError:
+        return None
+    plugin_dir = os.path.join(BENCH_DIR, "..", "agent_based")
+    package.__path__.insert(0, os.path.abspath(plugin_dir))
+    parsers = {}
+    for section, module, function in PARSERS:
+        plugin = importlib.import_module("cmk.base.plugins.agent_based.%s" % module)
+        parsers[section] = getattr(plugin, function)
+    return parsers
+
+
+def bench_parser(parse_function, string_table, min_time=0.5):
+    """Return parse runs per second and parsed objects per second"""
+    runs = 0
+    objects = 0
+    started = time.perf_counter()
+    while True:
+        objects = len(parse_function(string_table))
+        runs += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            return runs / elapsed, runs * objects / elapsed
+
+
+def run_scenario(name, certfile, keyfile, agent_args, parsers, env):
+    scenario = SCENARIOS[name]
+    inventory = mock_nsx.generate_inventory(**scenario["inventory"])
+    # All nodes of a cluster serve the same inventory
+    servers = [
+        mock_nsx.start_server(inventory, certfile, keyfile, **scenario["server"])
+        for _i in range(scenario.get("nodes", 1))
+    ]
+    if "nodes" in scenario:
+        ports = [server.server_address[1] for server in servers]
+        ports += [unused_port() for _i in range(scenario.get("dead_nodes", 0))]
+        inventory["cluster_nodes"] = ["127.0.0.1:%d" % port for port in ports]
+        agent_args = ["--discover-nodes"] + agent_args
+    try:
+        port = servers[0].server_address[1]
+        output, wall_time, max_rss = run_agent(port, agent_args, env)
+        result = {
+            "wall_time": round(wall_time, 3),
+            "requests": sum(server.counters.get("requests", 0) for server in servers),
+            "throttled": sum(server.counters.get("throttled", 0) for server in servers),
+            "max_rss_mb": round(max_rss / 1024.0, 1),
+            "output_bytes": len(output.encode()),
+            "parsers": {},
+        }
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+    if parsers is not None:
+        tables = split_sections(output)
+        for section, parse_function in parsers.items():
+            if section not in tables:
+                continue
+            runs, objects = bench_parser(parse_function, tables[section])
+            result["parsers"][section] = {
+                "runs_per_s": round(runs, 1),
+                "objects_per_s": round(objects),
+            }
+    return result
+
+
+def check_thresholds(name, result, thresholds):
+    """Return a list of violated thresholds of one scenario"""
+    limits = thresholds.get(name, {})
+    violations = []
+    for key in ["wall_time", "requests", "max_rss_mb", "output_bytes"]:
+        if key in limits and result[key] > limits[key]:
+            violations.append(
+                "%s: %s %s exceeds %s" % (name, key, result[key], limits[key])
+            )
+    for section, minimum in limits.get("parsers_min_objects_per_s", {}).items():
+        measured = result["parsers"].get(section)
+        if measured is not None and measured["objects_per_s"] < minimum:
+            violations.append(
+                "%s: %s parses %s objects/s, below %s"
+                % (name, section, measured["objects_per_s"], minimum)
+            )
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="scenario to run, may be given multiple times (default: all)",
+    )
+    parser.add_argument(
+        "--thresholds",
+        default=os.path.join(BENCH_DIR, "thresholds.json"),
+        help="JSON file with the regression thresholds",
+    )
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument(
+        "agent_args",
+        nargs="*",
+        help="additional agent_nsx options, after --",
+    )
+    args = parser.parse_args()
+
+    with open(args.thresholds) as f:
+        thresholds = json.load(f)
+
+    parsers = load_parsers()
+    if parsers is None:
+        sys.stderr.write("Checkmk plugin API not found, skipping parser benchmarks\n")
+
+    results = {}
+    violations = []
+    with tempfile.TemporaryDirectory() as tmp:
+        certfile, keyfile = create_certificate(tmp)
+        # Keep caches of the agent away from a real site
+        env = dict(os.environ, OMD_ROOT=tmp)
+        for name in args.scenario or list(SCENARIOS):
+            results[name] = run_scenario(
+                name, certfile, keyfile, args.agent_args, parsers, env
+            )
+            violations += check_thresholds(name, results[name], thresholds)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, result in results.items():
+            print(
+                "%-9s wall %7.3fs  requests %5d  throttled %4d  rss %6.1f MB  "
+                "output %9d B"
+                % (
+                    name,
+                    result["wall_time"],
+                    result["requests"],
+                    result["throttled"],
+                    result["max_rss_mb"],
+                    result["output_bytes"],
+                )
+            )
+            for section, measured in result["parsers"].items():
+                print(
+                    "          %-18s %10.1f parses/s %12d objects/s"
+                    % (section, measured["runs_per_s"], measured["objects_per_s"])
+                )
+
+    for violation in violations:
+        sys.stderr.write("REGRESSION %s\n" % violation)
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Fixtures for the tests of agent_nsx and the section parsers
+
+agent_nsx is loaded from its script and queried against the mock NSX
+Manager from bench/mock_nsx.py. The plugins are imported through the
+Checkmk plugin API if it is installed. Without it, a minimal stand-in for
+the parts of the API the plugins use is registered, so the parsers and
+checks can be tested outside of a Checkmk site as well.
+"""
+
+import enum
+import importlib
+import importlib.machinery
+import importlib.util
+import os
+import sys
+import time
+import types
+from typing import Any, Iterable, List, NamedTuple
+
+import pytest
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(REPO_DIR, "bench"))
+
+import mock_nsx  # noqa: E402
+import run_benchmarks  # noqa: E402
+
+PLUGIN_PACKAGE = "cmk.base.plugins.agent_based"
+
+
+class _State(enum.IntEnum):
+    OK = 0
+    WARN = 1
+    CRIT = 2
+    UNKNOWN = 3
+
+
+class _Service(NamedTuple):
+    item: Any = None
+    parameters: Any = None
+
+
+class _Result(NamedTuple):
+    state: _State
+    summary: Any = None
+    notice: Any = None
+
+
+class _Metric(NamedTuple):
+    name: str
+    value: float
+    levels: Any = None
+
+
+class _GetRateError(Exception):
+    pass
+
+
+def _get_rate(value_store, key, timestamp, value, raise_overflow=False):
+    last = value_store.get(key)
+    value_store[key] = (timestamp, value)
+    if last is None or timestamp <= last[0]:
+        raise _GetRateError("Initialized: %r" % key)
+    rate = (value - last[1]) / (timestamp - last[0])
+    if rate < 0 and raise_overflow:
+        raise _GetRateError("Counter overflow: %r" % key)
+    return rate
+
+
+def _check_levels(
+    value,
+    *,
+    levels_upper=None,
+    levels_lower=None,
+    metric_name=None,
+    render_func=None,
+    label=None,
+    boundaries=None,
+    notice_only=False,
+):
+    state = _State.OK
+    if levels_upper and value >= levels_upper[1]:
+        state = _State.CRIT
+    elif levels_upper and value >= levels_upper[0]:
+        state = _State.WARN
+    if levels_lower and value < levels_lower[1]:
+        state = _State.CRIT
+    elif levels_lower and value < levels_lower[0]:
+        state = max(state, _State.WARN)
+    text = (render_func or str)(value)
+    if label:
+        text = "%s: %s" % (label, text)
+    if notice_only:
+        yield _Result(state=state, notice=text)
+    else:
+        yield _Result(state=state, summary=text)
+    if metric_name:
+        yield _Metric(metric_name, value, levels_upper)
+
+
+def _plugin_api_stand_in():
+    """Register the stand-in for the Checkmk plugin API in sys.modules"""
+    v1 = types.ModuleType(PLUGIN_PACKAGE + ".agent_based_api.v1")
+    v1.State = _State
+    v1.Service = _Service
+    v1.Result = _Result
+    v1.Metric = _Metric
+    v1.GetRateError = _GetRateError
+    v1.get_rate = _get_rate
+    v1.get_value_store = dict
+    v1.check_levels = _check_levels
+    v1.register = types.SimpleNamespace(
+        agent_section=lambda **kwargs: None,
+        check_plugin=lambda **kwargs: None,
+    )
+    v1.render = types.SimpleNamespace(
+        bytes=lambda v: "%d B" % v,
+        disksize=lambda v: "%d B" % v,
+        iobandwidth=lambda v: "%.1f B/s" % v,
+        percent=lambda v: "%.1f%%" % v,
+        timespan=lambda v: "%.3f s" % v,
+    )
+    type_defs = types.ModuleType(v1.__name__ + ".type_defs")
+    type_defs.StringTable = List[List[str]]
+    type_defs.CheckResult = Iterable[Any]
+    type_defs.DiscoveryResult = Iterable[Any]
+    v1.type_defs = type_defs
+
+    package = None
+    for name in ["cmk", "cmk.base", "cmk.base.plugins", PLUGIN_PACKAGE]:
+        package = sys.modules.setdefault(name, types.ModuleType(name))
+        package.__path__ = getattr(package, "__path__", [])
+    api = types.ModuleType(PLUGIN_PACKAGE + ".agent_based_api")
+    api.__path__ = []
+    api.v1 = v1
+    sys.modules[api.__name__] = api
+    sys.modules[v1.__name__] = v1
+    sys.modules[type_defs.__name__] = type_defs
+    return package
+
+
+def load_plugin(name):
+    """Import the plugin agent_based/name.py of this package"""
+    try:
+        package = importlib.import_module(PLUGIN_PACKAGE)
+    except ImportError:
+        package = _plugin_api_stand_in()
+    plugin_dir = os.path.abspath(os.path.join(REPO_DIR, "agent_based"))
+    if plugin_dir not in package.__path__:
+        package.__path__.insert(0, plugin_dir)
+    return importlib.import_module("%s.%s" % (PLUGIN_PACKAGE, name))
+
+
+@pytest.fixture(scope="session")
+def agent_module():
+    """The agent_nsx script, loaded as a module without running main()"""
+    path = os.path.join(REPO_DIR, "agents", "special", "agent_nsx")
+    argv = sys.argv
+    sys.argv = [
+        path,
+        "--address",
+        "127.0.0.1:1",
+        "--username",
+        "admin",
+        "--password",
+        "secret",
+        "--no-cert-check",
+        "nsx",
+    ]
+    try:
+        loader = importlib.machinery.SourceFileLoader("agent_nsx", path)
+        spec = importlib.util.spec_from_loader("agent_nsx", loader)
+        module = importlib.util.module_from_spec(spec)
+        loader.exec_module(module)
+    finally:
+        sys.argv = argv
+    return module
+
+
+@pytest.fixture
+def agent(agent_module):
+    """agent_nsx with the state of a fresh run"""
+    agent_module.deadline = time.monotonic() + agent_module.opt_deadline
+    agent_module.scheduler = agent_module.RequestScheduler(0, 10)
+    agent_module.response_cache = None
+    agent_module.endpoint_stats.clear()
+    agent_module.run_stats.clear()
+    agent_module.run_stats["bytes_received"] = 0
+    use_manager(agent_module, ["127.0.0.1:1"])
+    return agent_module
+
+
+def use_manager(agent, addresses):
+    """Let agent query the manager nodes at addresses"""
+    agent.args_dict["address"] = addresses[0]
+    agent.manager_pool = agent.ManagerPool(addresses)
+    return agent.manager_pool
+
+
+@pytest.fixture(scope="session")
+def certificate(tmp_path_factory):
+    return run_benchmarks.create_certificate(tmp_path_factory.mktemp("cert"))
+
+
+@pytest.fixture
+def start_mock(certificate):
+    """Start mock NSX Managers, they are shut down after the test"""
+    servers = []
+
+    def start(inventory=None, **limits):
+        server = mock_nsx.start_server(
+            inventory or mock_nsx.generate_inventory(), *certificate, **limits
+        )
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def address(server):
+    return "127.0.0.1:%d" % server.server_address[1]
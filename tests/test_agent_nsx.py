@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Request handling of agent_nsx against the mock NSX Manager"""
+
+import time
+from email.utils import formatdate
+
+import pytest
+import requests
+
+import mock_nsx
+from conftest import address, use_manager
+from run_benchmarks import unused_port
+
+
+def certificates_url(agent):
+    return "https://%s/api/v1/trust-management/certificates" % agent.args_dict[
+        "address"
+    ]
+
+
+class TestRequestScheduler:
+    def test_throttling_halves_limit_and_pauses(self, agent):
+        scheduler = agent.RequestScheduler(0, 8)
+        scheduler.acquire()
+        scheduler.release(throttled=True, delay=5.0)
+        assert scheduler.limit == 4
+        assert scheduler.throttled == 1
+        assert scheduler.paused_until > time.monotonic() + 4
+
+    def test_limit_grows_after_successes(self, agent):
+        scheduler = agent.RequestScheduler(0, 8)
+        scheduler.limit = 2
+        for _i in range(2):
+            scheduler.acquire()
+            scheduler.release()
+        assert scheduler.limit == 3
+
+    def test_rate_limit(self, agent):
+        scheduler = agent.RequestScheduler(20, 10)
+        started = time.monotonic()
+        # The first 20 requests are sent at once, the next 5 at 20/s
+        for _i in range(25):
+            scheduler.acquire()
+            scheduler.release()
+        assert time.monotonic() - started >= 0.2
+
+    def test_acquire_stops_at_deadline(self, agent):
+        scheduler = agent.RequestScheduler(0, 1)
+        scheduler.acquire()
+        agent.deadline = time.monotonic() + 0.1
+        with pytest.raises(agent.DeadlineExceeded):
+            scheduler.acquire()
+
+    @pytest.mark.parametrize(
+        "retry_after, low, high",
+        [
+            ("3", 3.0, 3.0),
+            (formatdate(time.time() + 10, usegmt=True), 8.0, 10.0),
+            (None, 0.0, 4.0),
+            ("soon", 0.0, 4.0),
+        ],
+    )
+    def test_backoff(self, agent, retry_after, low, high):
+        response = requests.models.Response()
+        if retry_after is not None:
+            response.headers["Retry-After"] = retry_after
+        delay = agent.scheduler.backoff(response, 2)
+        assert low <= delay <= high
+
+
+class TestResponseCache:
+    def test_evicts_least_recently_used(self, agent, tmp_path):
+        cache = agent.ResponseCache(str(tmp_path / "responses"), 100, 3600)
+        cache.put("a", '"a"', 1, {"a": 1}, 60)
+        cache.put("b", '"b"', 1, {"b": 1}, 30)
+        cache.get("a")
+        cache.put("c", '"c"', 1, {"c": 1}, 30)
+        assert list(cache.entries) == ["a", "c"]
+        assert cache.size == 90
+
+    def test_save_and_load(self, agent, tmp_path):
+        path = str(tmp_path / "responses")
+        cache = agent.ResponseCache(path, 100, 3600)
+        cache.put("a", '"a"', 1, {"a": 1}, 10)
+        cache.put("b", '"b"', 1, {"b": 1}, 10)
+        cache.entries["b"]["stored"] -= 7200
+        cache.save()
+
+        loaded = agent.ResponseCache(path, 100, 3600)
+        loaded.load()
+        assert list(loaded.entries) == ["a"]
+        assert loaded.get("a")["body"] == {"a": 1}
+        assert loaded.size == 10
+
+    def test_not_modified(self, agent, start_mock, tmp_path):
+        server = start_mock()
+        use_manager(agent, [address(server)])
+        agent.response_cache = agent.ResponseCache(
+            str(tmp_path / "responses"), 1024 * 1024, 3600
+        )
+        first = agent.query(certificates_url(agent))
+        second = agent.query(certificates_url(agent))
+        assert second == first
+        assert server.counters["not_modified"] == 1
+
+
+class TestQuery:
+    def test_query_paged(self, agent, start_mock, monkeypatch):
+        server = start_mock(mock_nsx.generate_inventory(certificates=10))
+        use_manager(agent, [address(server)])
+        monkeypatch.setattr(agent, "opt_page_size", 3)
+        certs = list(
+            agent.query_paged(certificates_url(agent), fields=["id", "display_name"])
+        )
+        assert [c["id"] for c in certs] == ["cert-%05d" % c for c in range(10)]
+        assert all(set(c) == {"id", "display_name"} for c in certs)
+        assert server.counters["requests"] == 4
+
+    def test_retry_throttled(self, agent, start_mock):
+        # The mock answers the second request with 429 and Retry-After: 1
+        server = start_mock(rate_limit=1)
+        use_manager(agent, [address(server)])
+        agent.query(certificates_url(agent))
+        assert agent.query(certificates_url(agent))["result_count"] == 10
+        assert server.counters["throttled"] == 1
+        assert agent.scheduler.throttled == 1
+        assert agent.endpoint_stats["certs"]["retries"] == 1
+
+
+class TestManagerPool:
+    def test_least_outstanding_requests(self, agent):
+        pool = agent.ManagerPool(["a", "b", "c"])
+        busy = pool.acquire()
+        nodes = [pool.acquire(), pool.acquire()]
+        assert busy not in nodes
+        pool.release(busy, 0.1)
+        assert pool.acquire() is busy
+
+    def test_failover(self, agent, start_mock):
+        server = start_mock()
+        dead = "127.0.0.1:%d" % unused_port()
+        pool = use_manager(agent, [dead, address(server)])
+        certs = list(agent.query_paged(certificates_url(agent)))
+        assert len(certs) == 10
+        assert [node.state() for node in pool.nodes] == ["failed", "up"]
+        assert pool.nodes[1].requests == 1
+
+    def test_keeps_last_node(self, agent):
+        pool = use_manager(agent, ["127.0.0.1:%d" % unused_port()])
+        for _i in range(2):
+            with pytest.raises(requests.exceptions.ConnectionError):
+                agent.query(certificates_url(agent))
+        assert pool.nodes[0].state() == "up"
+        assert pool.nodes[0].errors == 2
+
+    def test_read_timeout_fails_request_only(self, agent, start_mock, monkeypatch):
+        slow = start_mock(latency=1.0)
+        pool = use_manager(agent, [address(slow), address(start_mock())])
+        monkeypatch.setattr(agent, "opt_timeout", 0.3)
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            agent.query(certificates_url(agent))
+        assert [node.state() for node in pool.nodes] == ["up", "up"]
+
+    def test_discover_nodes(self, agent, start_mock):
+        inventory = mock_nsx.generate_inventory()
+        servers = [start_mock(inventory) for _i in range(2)]
+        inventory["cluster_nodes"] = [address(server) for server in servers]
+        pool = use_manager(agent, ["127.0.0.1:%d" % servers[0].server_address[1]])
+        agent.discover_nodes()
+        assert [(n.address, n.state()) for n in pool.nodes] == [
+            (address(servers[0]), "up"),
+            (address(servers[1]), "up"),
+        ]
+
+    def test_node_down_in_earlier_run(self, agent, tmp_path, monkeypatch):
+        monkeypatch.setenv("OMD_ROOT", str(tmp_path))
+        pool = use_manager(agent, ["a", "b"])
+        pool.nodes[0].failed = True
+        pool.save()
+
+        pool = use_manager(agent, ["a", "b"])
+        pool.load()
+        assert [node.state() for node in pool.nodes] == ["down", "up"]
+        assert pool.acquire().address == "b"
+
+
+def test_reduce_pool_status(agent):
+    pool = {
+        "pool_id": "pool-1",
+        "status": "PARTIALLY_UP",
+        "members": [
+            {"status": "UP"},
+            {"status": "UP"},
+            {"status": "DOWN"},
+            {"status": "GRACEFUL_DISABLED"},
+            {"status": "UNUSED"},
+        ],
+    }
+    assert agent.reduce_pool_status(pool)["members"] == [4, 2, 1, 0, 1]
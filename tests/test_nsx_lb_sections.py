@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Parsing of the ;-separated LB sections sent by agent_nsx"""
+
+import pytest
+
+from conftest import load_plugin
+
+nsx_loadbalancer = load_plugin("nsx_loadbalancer")
+nsx_vserver = load_plugin("nsx_vserver")
+
+COUNTERS = ["1700000000000", "100", "200", "3", "4", "5", "60"]
+
+
+def test_parse_loadbalancer_with_counters():
+    parsed = nsx_loadbalancer.parse_nsx_loadbalancer(
+        [["lb1", "lb-0001", "UP", "True"] + COUNTERS]
+    )
+    assert parsed["lb1"]["id"] == "lb-0001"
+    assert parsed["lb1"]["enabled"] == "True"
+    assert parsed["lb1"]["counters"].bytes_out == 200
+    assert parsed["lb1"]["counters"].total_sessions == 60
+
+
+def test_parse_loadbalancer_without_counters():
+    parsed = nsx_loadbalancer.parse_nsx_loadbalancer(
+        [["lb1", "lb-0001", "UP", "True"]]
+    )
+    assert parsed["lb1"]["status"] == "UP"
+    assert parsed["lb1"]["counters"] is None
+
+
+@pytest.mark.parametrize("counters", [COUNTERS, []])
+def test_parse_loadbalancer_separator_in_name(counters):
+    # Agents before the names were sanitized send the separator unchanged
+    parsed = nsx_loadbalancer.parse_nsx_loadbalancer(
+        [["web", "prod", "lb-0001", "UP", "True"] + counters]
+    )
+    assert list(parsed) == ["web;prod"]
+    assert parsed["web;prod"]["id"] == "lb-0001"
+    assert parsed["web;prod"]["enabled"] == "True"
+    assert (parsed["web;prod"]["counters"] is None) == (not counters)
+
+
+def test_parse_vservers_with_counters():
+    parsed = nsx_vserver.parse_nsx_vservers(
+        [["vs-0001", "UP", "True", "web"] + COUNTERS]
+    )
+    assert parsed["web"]["id"] == "vs-0001"
+    assert parsed["web"]["counters"].packets_in == 3
+
+
+@pytest.mark.parametrize("counters", [COUNTERS, []])
+def test_parse_vservers_separator_in_name(counters):
+    # Agents before the names were sanitized send the separator unchanged
+    parsed = nsx_vserver.parse_nsx_vservers(
+        [["vs-0001", "UP", "True", "web", "prod"] + counters]
+    )
+    assert list(parsed) == ["web;prod"]
+    assert parsed["web;prod"]["status"] == "UP"
+    assert (parsed["web;prod"]["counters"] is None) == (not counters)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Parsing of the tab-separated record sections sent by agent_nsx
+
+Checkmk strips empty trailing fields from agent lines, so every record may
+arrive shorter than sent.
+"""
+
+from conftest import load_plugin
+
+nsx_certificates = load_plugin("nsx_certificates")
+nsx_edge_resources = load_plugin("nsx_edge_resources")
+nsx_edges = load_plugin("nsx_edges")
+nsx_pools = load_plugin("nsx_pools")
+
+
+def test_parse_edges():
+    parsed = nsx_edges.parse_nsx_edges([["u1", "edge1", "UP"], ["u2", "edge2"]])
+    assert parsed["edge1"] == nsx_edges.EdgeData("u1", "UP")
+    assert parsed["edge2"] == nsx_edges.EdgeData("u2", "")
+
+
+def test_parse_edges_without_name():
+    assert nsx_edges.parse_nsx_edges([["u1"]]) == {}
+
+
+def test_parse_edges_json():
+    parsed = nsx_edges.parse_nsx_edges(
+        [['[{"node_uuid": "u1", "node_display_name": "edge1", "status": "UP"}]']]
+    )
+    assert parsed["edge1"] == nsx_edges.EdgeData("u1", "UP")
+
+
+def test_parse_certificates_without_expiry():
+    parsed = nsx_certificates.parse_nsx_certificates(
+        [["c1", "cert1", "1700000000000", "cert1.example.com"], ["c2", "cert2"]]
+    )
+    assert parsed["cert1"].not_after is not None
+    assert parsed["cert2"].not_after is None
+
+
+def test_parse_pools_short_rows():
+    parsed = nsx_pools.parse_nsx_pools(
+        [["p1", "pool1"], ["p2", "pool2", "UP", "4", "3", "1", "0", "0"]]
+    )
+    assert parsed["pool1"].status == ""
+    assert parsed["pool1"].members is None
+    assert parsed["pool2"].members == nsx_pools.MemberCounts(4, 3, 1, 0, 0)
+    assert parsed["pool2"].counters is None
+
+
+def test_parse_edge_resources_short_lines():
+    parsed = nsx_edge_resources.parse_nsx_edge_resources(
+        [
+            ["edge1", "mem", "100", "50", "10"],
+            ["edge1", "cpu", "42.5", "61.0"],
+            ["edge1", "disk"],
+            ["edge1", "uplink", "fp-eth0", "1700000000000", "1", "2"],
+            ["edge2", "uplink", "fp-eth0"],
+        ]
+    )
+    assert parsed["edge1"]["mem"] == nsx_edge_resources.EdgeMem(
+        102400, 51200, 10240, None
+    )
+    assert parsed["edge1"]["cpu"] == nsx_edge_resources.EdgeCpu(
+        42.5, 61.0, None, None
+    )
+    assert parsed["edge1"]["disk"] == nsx_edge_resources.EdgeDisk(None, None)
+    assert parsed["edge1"]["uplinks"]["fp-eth0"] == nsx_edge_resources.EdgeUplink(
+        1700000000.0, 1, 2, 0, 0, 0, 0
+    )
+    assert "uplinks" not in parsed["edge2"]
@@ -2,3 +2,286 @@ check_metrics["check_mk-nsx_memory.mem_usage"] = {
     "usage"     : { "name" : "mem_used" },
     "mem_total" : { "auto_graph" : False },
 }
+
+metric_info["nsx_agent_runtime"] = {
+    "title": _("Agent run time"),
+    "unit": "s",
+    "color": "11/a",
+}
+
+for _nsx_section, _nsx_title, _nsx_color in [
+    ("edges", _("Edges"), "21/a"),
+    ("backups", _("Backups"), "31/a"),
+    ("status", _("Manager status"), "41/a"),
+    ("lb", _("Load balancers"), "15/a"),
+    ("certificates", _("Certificates"), "25/a"),
+]:
+    metric_info["nsx_section_runtime_%s" % _nsx_section] = {
+        "title": _("Run time of section %s") % _nsx_title,
+        "unit": "s",
+        "color": _nsx_color,
+    }
+
+graph_info["nsx_agent_section_runtime"] = {
+    "title": _("NSX agent run time by section"),
+    "metrics": [
+        ("nsx_section_runtime_edges", "stack"),
+        ("nsx_section_runtime_backups", "stack"),
+        ("nsx_section_runtime_status", "stack"),
+        ("nsx_section_runtime_lb", "stack"),
+        ("nsx_section_runtime_certificates", "stack"),
+        ("nsx_agent_runtime", "line"),
+    ],
+    "optional_metrics": [
+        "nsx_section_runtime_edges",
+        "nsx_section_runtime_backups",
+        "nsx_section_runtime_status",
+        "nsx_section_runtime_lb",
+        "nsx_section_runtime_certificates",
+    ],
+}
+
+metric_info["nsx_api_requests"] = {
+    "title": _("API requests"),
+    "unit": "count",
+    "color": "11/a",
+}
+
+metric_info["nsx_api_latency"] = {
+    "title": _("Total API latency"),
+    "unit": "s",
+    "color": "21/a",
+}
+
+metric_info["nsx_api_latency_p95"] = {
+    "title": _("95th percentile API latency"),
+    "unit": "s",
+    "color": "23/a",
+}
+
+metric_info["nsx_api_bytes"] = {
+    "title": _("Bytes received from API"),
+    "unit": "bytes",
+    "color": "31/a",
+}
+
+metric_info["nsx_api_retries"] = {
+    "title": _("Retried API requests"),
+    "unit": "count",
+    "color": "14/a",
+}
+
+metric_info["nsx_api_errors"] = {
+    "title": _("Failed API requests"),
+    "unit": "count",
+    "color": "13/a",
+}
+
+graph_info["nsx_api_latency"] = {
+    "title": _("NSX API latency"),
+    "metrics": [
+        ("nsx_api_latency", "area"),
+        ("nsx_api_latency_p95", "line"),
+    ],
+}
+
+graph_info["nsx_api_requests"] = {
+    "title": _("NSX API requests"),
+    "metrics": [
+        ("nsx_api_requests", "line"),
+        ("nsx_api_retries", "line"),
+        ("nsx_api_errors", "line"),
+    ],
+}
+
+metric_info["nsx_lb_bytes_in"] = {
+    "title": _("Incoming traffic"),
+    "unit": "bytes/s",
+    "color": "15/a",
+}
+
+metric_info["nsx_lb_bytes_out"] = {
+    "title": _("Outgoing traffic"),
+    "unit": "bytes/s",
+    "color": "35/a",
+}
+
+metric_info["nsx_lb_packets_in"] = {
+    "title": _("Incoming packets"),
+    "unit": "1/s",
+    "color": "16/a",
+}
+
+metric_info["nsx_lb_packets_out"] = {
+    "title": _("Outgoing packets"),
+    "unit": "1/s",
+    "color": "36/a",
+}
+
+metric_info["nsx_lb_current_sessions"] = {
+    "title": _("Current sessions"),
+    "unit": "count",
+    "color": "26/a",
+}
+
+metric_info["nsx_lb_session_rate"] = {
+    "title": _("New sessions"),
+    "unit": "1/s",
+    "color": "42/a",
+}
+
+graph_info["nsx_lb_traffic"] = {
+    "title": _("NSX load balancer traffic"),
+    "metrics": [
+        ("nsx_lb_bytes_in", "area"),
+        ("nsx_lb_bytes_out", "-area"),
+    ],
+}
+
+graph_info["nsx_lb_packets"] = {
+    "title": _("NSX load balancer packets"),
+    "metrics": [
+        ("nsx_lb_packets_in", "area"),
+        ("nsx_lb_packets_out", "-area"),
+    ],
+}
+
+graph_info["nsx_lb_sessions"] = {
+    "title": _("NSX load balancer sessions"),
+    "metrics": [
+        ("nsx_lb_current_sessions", "line"),
+    ],
+}
+
+metric_info["nsx_pool_members_up_perc"] = {
+    "title": _("Enabled members up"),
+    "unit": "%",
+    "color": "21/a",
+}
+
+metric_info["nsx_edge_datapath_cpu"] = {
+    "title": _("Datapath CPU usage"),
+    "unit": "%",
+    "color": "11/a",
+}
+
+metric_info["nsx_edge_datapath_cpu_max"] = {
+    "title": _("Datapath CPU usage of the busiest core"),
+    "unit": "%",
+    "color": "13/a",
+}
+
+metric_info["nsx_edge_service_cpu"] = {
+    "title": _("Service CPU usage"),
+    "unit": "%",
+    "color": "21/a",
+}
+
+metric_info["nsx_edge_service_cpu_max"] = {
+    "title": _("Service CPU usage of the busiest core"),
+    "unit": "%",
+    "color": "23/a",
+}
+
+metric_info["nsx_edge_mem_usage"] = {
+    "title": _("Memory usage"),
+    "unit": "%",
+    "color": "31/a",
+}
+
+metric_info["nsx_edge_datapath_mem_usage"] = {
+    "title": _("Datapath memory usage"),
+    "unit": "%",
+    "color": "33/a",
+}
+
+metric_info["nsx_edge_disk_usage"] = {
+    "title": _("Disk usage"),
+    "unit": "%",
+    "color": "41/a",
+}
+
+metric_info["nsx_edge_uplink_in"] = {
+    "title": _("Uplink incoming traffic"),
+    "unit": "bytes/s",
+    "color": "15/a",
+}
+
+metric_info["nsx_edge_uplink_out"] = {
+    "title": _("Uplink outgoing traffic"),
+    "unit": "bytes/s",
+    "color": "35/a",
+}
+
+metric_info["nsx_edge_uplink_packets_in"] = {
+    "title": _("Uplink incoming packets"),
+    "unit": "1/s",
+    "color": "16/a",
+}
+
+metric_info["nsx_edge_uplink_packets_out"] = {
+    "title": _("Uplink outgoing packets"),
+    "unit": "1/s",
+    "color": "36/a",
+}
+
+metric_info["nsx_edge_uplink_drops_in"] = {
+    "title": _("Uplink dropped incoming packets"),
+    "unit": "1/s",
+    "color": "13/a",
+}
+
+metric_info["nsx_edge_uplink_drops_out"] = {
+    "title": _("Uplink dropped outgoing packets"),
+    "unit": "1/s",
+    "color": "14/a",
+}
+
+graph_info["nsx_edge_cpu"] = {
+    "title": _("NSX edge CPU usage"),
+    "metrics": [
+        ("nsx_edge_datapath_cpu", "line"),
+        ("nsx_edge_datapath_cpu_max", "line"),
+        ("nsx_edge_service_cpu", "line"),
+        ("nsx_edge_service_cpu_max", "line"),
+    ],
+    "optional_metrics": [
+        "nsx_edge_datapath_cpu_max",
+        "nsx_edge_service_cpu_max",
+    ],
+    "range": (0, 100),
+}
+
+graph_info["nsx_edge_memory"] = {
+    "title": _("NSX edge memory usage"),
+    "metrics": [
+        ("nsx_edge_mem_usage", "line"),
+        ("nsx_edge_datapath_mem_usage", "line"),
+    ],
+    "optional_metrics": ["nsx_edge_datapath_mem_usage"],
+    "range": (0, 100),
+}
+
+graph_info["nsx_edge_uplink_traffic"] = {
+    "title": _("NSX edge uplink traffic"),
+    "metrics": [
+        ("nsx_edge_uplink_in", "area"),
+        ("nsx_edge_uplink_out", "-area"),
+    ],
+}
+
+graph_info["nsx_edge_uplink_packets"] = {
+    "title": _("NSX edge uplink packets"),
+    "metrics": [
+        ("nsx_edge_uplink_packets_in", "area"),
+        ("nsx_edge_uplink_packets_out", "-area"),
+    ],
+}
+
+graph_info["nsx_edge_uplink_drops"] = {
+    "title": _("NSX edge uplink dropped packets"),
+    "metrics": [
+        ("nsx_edge_uplink_drops_in", "area"),
+        ("nsx_edge_uplink_drops_out", "-area"),
+    ],
+}
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+
+from cmk.gui.i18n import _
+from cmk.gui.valuespec import (
+    Dictionary,
+    Float,
+    Tuple,
+)
+
+from cmk.gui.plugins.wato import (
+    CheckParameterRulespecWithoutItem,
+    rulespec_registry,
+    RulespecGroupCheckParametersApplications,
+)
+
+
+def _parameter_valuespec_nsx_agent_perf():
+    return Dictionary(
+        elements=[
+            (
+                "runtime_levels",
+                Tuple(
+                    title=_("Run time of the special agent"),
+                    help=_(
+                        "Warn before a run of agent_nsx gets close to the check "
+                        "interval of the NSX Manager host."
+                    ),
+                    elements=[
+                        Float(
+                            title=_("Warning at"),
+                            unit=_("seconds"),
+                            default_value=45.0,
+                        ),
+                        Float(
+                            title=_("Critical at"),
+                            unit=_("seconds"),
+                            default_value=55.0,
+                        ),
+                    ],
+                ),
+            ),
+        ],
+    )
+
+
+rulespec_registry.register(
+    CheckParameterRulespecWithoutItem(
+        title=lambda: _("NSX agent performance"),
+        check_group_name="nsx_agent_perf",
+        group=RulespecGroupCheckParametersApplications,
+        match_type="dict",
+        parameter_valuespec=_parameter_valuespec_nsx_agent_perf,
+    )
+)
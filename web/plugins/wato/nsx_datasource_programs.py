@@ -9,8 +9,14 @@ from cmk.gui.plugins.wato import (
     rulespec_registry,
 )
 from cmk.gui.valuespec import (
+    Age,
     Dictionary,
     DropdownChoice,
+    FixedValue,
+    Float,
+    Integer,
+    ListChoice,
+    ListOfStrings,
     TextAscii,
 )
 from cmk.gui.watolib.rulespecs import Rulespec
@@ -55,8 +61,271 @@ def _valuespec_special_agents_nsx():
                     default_value=False,
                 ),
             ),
+            (
+                "addresses",
+                ListOfStrings(
+                    title=_("Additional manager nodes"),
+                    help=_(
+                        "Addresses of further nodes of the NSX-T Manager cluster. "
+                        "The requests of the agent are spread across the host and "
+                        "these nodes, a node which cannot be reached is skipped."
+                    ),
+                    valuespec=TextAscii(size=40),
+                    allow_empty=False,
+                ),
+            ),
+            (
+                "discover_nodes",
+                FixedValue(
+                    True,
+                    title=_("Discover manager nodes"),
+                    help=_(
+                        "Query the nodes of the NSX-T Manager cluster and spread the "
+                        "requests of the agent across them. The configured addresses "
+                        "are only used if none of the nodes answers. The nodes are "
+                        "addressed by IP, so with SSL certificate checking their "
+                        "certificates have to be valid for their IP addresses."
+                    ),
+                    totext=_("Spread the requests across all manager nodes"),
+                ),
+            ),
+            (
+                "sections",
+                ListChoice(
+                    title=_("Retrieve information about..."),
+                    help=_(
+                        "Sections which are not selected here are not queried from "
+                        "the NSX-T Manager at all."
+                    ),
+                    choices=[
+                        ("edges", _("Edges")),
+                        ("backups", _("Backups")),
+                        ("status", _("Manager CPU, memory and uptime")),
+                        ("lb", _("Load balancers, virtual servers and pools")),
+                        ("certificates", _("Certificates")),
+                    ],
+                    default_value=["edges", "backups", "status", "lb", "certificates"],
+                    allow_empty=False,
+                ),
+            ),
+            (
+                "edge_uplinks",
+                FixedValue(
+                    True,
+                    title=_("Edge uplink statistics"),
+                    help=_(
+                        "Also fetch the traffic counters of the datapath uplinks of "
+                        "every edge for the services NSX Edge Uplink. This needs one "
+                        "request per edge and one per uplink."
+                    ),
+                    totext=_("Fetch the statistics of the edge uplinks"),
+                ),
+            ),
+            (
+                "piggyback",
+                Dictionary(
+                    title=_("Send data to piggyback hosts"),
+                    help=_(
+                        "Instead of creating all services on the NSX-T Manager host, "
+                        "send the data of every edge or load balancer service as "
+                        "piggyback data to a host of its own. In the host name "
+                        "patterns <tt>{name}</tt> is replaced by the display name of "
+                        "the edge or load balancer service. A load balancer service "
+                        "is sent together with its virtual servers and pools."
+                    ),
+                    elements=[
+                        (
+                            "edges",
+                            TextAscii(
+                                title=_("Host name of edges"),
+                                default_value="{name}",
+                                allow_empty=False,
+                            ),
+                        ),
+                        (
+                            "lb",
+                            TextAscii(
+                                title=_("Host name of load balancer services"),
+                                default_value="{name}",
+                                allow_empty=False,
+                            ),
+                        ),
+                    ],
+                ),
+            ),
+            (
+                "pool_size",
+                Integer(
+                    title=_("HTTP connection pool size"),
+                    help=_(
+                        "Number of connections to the NSX-T Manager which are kept "
+                        "open and reused during one agent run."
+                    ),
+                    default_value=10,
+                    minvalue=1,
+                ),
+            ),
+            (
+                "auth_mode",
+                DropdownChoice(
+                    title=_("Authentication mode"),
+                    help=_(
+                        "With HTTP Basic authentication the NSX-T Manager "
+                        "validates the credentials on every request. The session "
+                        "based modes log in once and use the session cookie for "
+                        "all further requests, either for a single agent run or "
+                        "kept across agent runs."
+                    ),
+                    choices=[
+                        ("basic", _("HTTP Basic authentication")),
+                        ("session", _("Session cookie, login once per run")),
+                        ("session-cached", _("Session cookie, kept across runs")),
+                    ],
+                    default_value="basic",
+                ),
+            ),
+            (
+                "max_workers",
+                Integer(
+                    title=_("Concurrent detail queries"),
+                    help=_(
+                        "Number of detail queries for edges, load balancer objects and "
+                        "certificates which are sent to the NSX-T Manager in parallel. "
+                        "Set to 1 to query them one after another."
+                    ),
+                    default_value=4,
+                    minvalue=1,
+                ),
+            ),
+            (
+                "max_rate",
+                Float(
+                    title=_("Maximum request rate"),
+                    help=_(
+                        "Upper limit of requests per second sent to the NSX-T Manager. "
+                        "Use 0 to disable the limit. Requests answered with 429 or 503 "
+                        "are retried after the time given by the manager and lower the "
+                        "number of concurrent requests."
+                    ),
+                    unit=_("requests/s"),
+                    default_value=50.0,
+                    minvalue=0.0,
+                ),
+            ),
+            (
+                "max_in_flight",
+                Integer(
+                    title=_("Maximum concurrent requests"),
+                    default_value=10,
+                    minvalue=1,
+                ),
+            ),
+            (
+                "cache_intervals",
+                Dictionary(
+                    title=_("Refresh intervals of sections"),
+                    help=_(
+                        "Sections listed here are only fetched from the NSX-T Manager "
+                        "when their last result is older than the given interval. In "
+                        "between the cached result is sent to Checkmk and marked as "
+                        "cached, so its age is shown with the services. Sections not "
+                        "listed here are fetched on every check cycle."
+                    ),
+                    elements=[
+                        ("edges", Age(title=_("Edges"), default_value=60)),
+                        ("backups", Age(title=_("Backups"), default_value=1800)),
+                        (
+                            "status",
+                            Age(
+                                title=_("Manager CPU, memory and uptime"),
+                                default_value=60,
+                            ),
+                        ),
+                        (
+                            "lb",
+                            Age(
+                                title=_("Load balancers, virtual servers and pools"),
+                                default_value=60,
+                            ),
+                        ),
+                        (
+                            "certificates",
+                            Age(title=_("Certificates"), default_value=1800),
+                        ),
+                    ],
+                ),
+            ),
+            (
+                "response_cache",
+                Dictionary(
+                    title=_("Revalidate cached API responses"),
+                    help=_(
+                        "Keep NSX-T API responses which carry an ETag across agent "
+                        "runs. They are revalidated with If-None-Match and reused when "
+                        "the manager reports them as not modified."
+                    ),
+                    elements=[
+                        (
+                            "max_size",
+                            Integer(
+                                title=_("Maximum cache size"),
+                                unit=_("MB"),
+                                default_value=20,
+                                minvalue=1,
+                            ),
+                        ),
+                        (
+                            "max_age",
+                            Age(
+                                title=_("Maximum age of cached responses"),
+                                default_value=3600,
+                            ),
+                        ),
+                    ],
+                ),
+            ),
+            (
+                "timeout",
+                Integer(
+                    title=_("Timeout of a single request"),
+                    unit=_("seconds"),
+                    default_value=30,
+                    minvalue=1,
+                ),
+            ),
+            (
+                "deadline",
+                Integer(
+                    title=_("Time budget of an agent run"),
+                    help=_(
+                        "Sections which fail or are not finished within this time are "
+                        "replaced by their last good output, so the agent always "
+                        "finishes before Checkmk's own timeout. Errors are reported by "
+                        "the service NSX Agent Sections."
+                    ),
+                    unit=_("seconds"),
+                    default_value=50,
+                    minvalue=1,
+                ),
+            ),
+        ],
+        optional_keys=[
+            "cert",
+            "addresses",
+            "discover_nodes",
+            "sections",
+            "edge_uplinks",
+            "piggyback",
+            "pool_size",
+            "auth_mode",
+            "max_workers",
+            "max_rate",
+            "max_in_flight",
+            "cache_intervals",
+            "response_cache",
+            "timeout",
+            "deadline",
         ],
-        optional_keys=["cert"],
     )
 
 
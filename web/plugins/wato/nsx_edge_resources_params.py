@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from cmk.gui.i18n import _
+from cmk.gui.valuespec import (
+    Dictionary,
+    Percentage,
+    TextAscii,
+    Tuple,
+)
+
+from cmk.gui.plugins.wato import (
+    CheckParameterRulespecWithItem,
+    rulespec_registry,
+    RulespecGroupCheckParametersApplications,
+)
+
+from cmk.gui.plugins.wato.nsx_loadbalancer_params import _rate_levels
+
+
+def _usage_levels(title, default_levels):
+    return Tuple(
+        title=title,
+        elements=[
+            Percentage(title=_("Warning at"), default_value=default_levels[0]),
+            Percentage(title=_("Critical at"), default_value=default_levels[1]),
+        ],
+    )
+
+
+def _parameter_valuespec_nsx_edge_resources():
+    return Dictionary(
+        elements=[
+            (
+                "datapath_cpu",
+                _usage_levels(
+                    _("Average CPU usage of the datapath cores"), (80.0, 90.0)
+                ),
+            ),
+            (
+                "service_cpu",
+                _usage_levels(
+                    _("Average CPU usage of the service cores"), (80.0, 90.0)
+                ),
+            ),
+            ("memory", _usage_levels(_("Memory usage"), (80.0, 90.0))),
+            (
+                "datapath_memory",
+                _usage_levels(_("Memory usage of the datapath"), (80.0, 90.0)),
+            ),
+            ("disk", _usage_levels(_("Disk usage"), (80.0, 90.0))),
+        ],
+    )
+
+
+rulespec_registry.register(
+    CheckParameterRulespecWithItem(
+        check_group_name="nsx_edge_resources",
+        group=RulespecGroupCheckParametersApplications,
+        item_spec=lambda: TextAscii(
+            title=_("Name of edge"),
+        ),
+        match_type="dict",
+        parameter_valuespec=_parameter_valuespec_nsx_edge_resources,
+        title=lambda: _("NSX edge resources"),
+    )
+)
+
+
+def _parameter_valuespec_nsx_edge_uplinks():
+    return Dictionary(
+        elements=[
+            ("bandwidth_in", _rate_levels(_("Incoming traffic"), _("bytes/s"))),
+            ("bandwidth_out", _rate_levels(_("Outgoing traffic"), _("bytes/s"))),
+            ("drops", _rate_levels(_("Dropped packets"), _("packets/s"))),
+        ],
+    )
+
+
+rulespec_registry.register(
+    CheckParameterRulespecWithItem(
+        check_group_name="nsx_edge_uplinks",
+        group=RulespecGroupCheckParametersApplications,
+        item_spec=lambda: TextAscii(
+            title=_("Edge and uplink"),
+            help=_("Name of the edge and of the uplink, e.g. edge01 fp-eth0"),
+        ),
+        match_type="dict",
+        parameter_valuespec=_parameter_valuespec_nsx_edge_uplinks,
+        title=lambda: _("NSX edge uplinks"),
+    )
+)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from cmk.gui.i18n import _
+from cmk.gui.valuespec import (
+    Dictionary,
+    Float,
+    Integer,
+    Percentage,
+    TextAscii,
+    Tuple,
+)
+
+from cmk.gui.plugins.wato import (
+    CheckParameterRulespecWithItem,
+    rulespec_registry,
+    RulespecGroupCheckParametersApplications,
+)
+
+
+def _rate_levels(title, unit):
+    return Tuple(
+        title=title,
+        elements=[
+            Float(title=_("Warning at"), unit=unit),
+            Float(title=_("Critical at"), unit=unit),
+        ],
+    )
+
+
+def _lb_counter_elements():
+    return [
+        (
+            "current_sessions",
+            Tuple(
+                title=_("Current sessions"),
+                elements=[
+                    Integer(title=_("Warning at"), unit=_("sessions")),
+                    Integer(title=_("Critical at"), unit=_("sessions")),
+                ],
+            ),
+        ),
+        ("session_rate", _rate_levels(_("New sessions"), _("sessions/s"))),
+        ("bytes_in", _rate_levels(_("Incoming traffic"), _("bytes/s"))),
+        ("bytes_out", _rate_levels(_("Outgoing traffic"), _("bytes/s"))),
+        ("packets_in", _rate_levels(_("Incoming packets"), _("packets/s"))),
+        ("packets_out", _rate_levels(_("Outgoing packets"), _("packets/s"))),
+    ]
+
+
+def _parameter_valuespec_nsx_loadbalancer():
+    return Dictionary(
+        elements=_lb_counter_elements(),
+    )
+
+
+rulespec_registry.register(
+    CheckParameterRulespecWithItem(
+        check_group_name="nsx_loadbalancer",
+        group=RulespecGroupCheckParametersApplications,
+        item_spec=lambda: TextAscii(
+            title=_("Name of load balancer service"),
+        ),
+        match_type="dict",
+        parameter_valuespec=_parameter_valuespec_nsx_loadbalancer,
+        title=lambda: _("NSX load balancer services"),
+    )
+)
+
+
+def _parameter_valuespec_nsx_vservers():
+    return Dictionary(
+        elements=_lb_counter_elements(),
+    )
+
+
+rulespec_registry.register(
+    CheckParameterRulespecWithItem(
+        check_group_name="nsx_vservers",
+        group=RulespecGroupCheckParametersApplications,
+        item_spec=lambda: TextAscii(
+            title=_("Name of virtual server"),
+        ),
+        match_type="dict",
+        parameter_valuespec=_parameter_valuespec_nsx_vservers,
+        title=lambda: _("NSX load balancer virtual servers"),
+    )
+)
+
+
+def _parameter_valuespec_nsx_pools():
+    return Dictionary(
+        elements=[
+            (
+                "members_up",
+                Tuple(
+                    title=_("Enabled members up"),
+                    help=_(
+                        "Levels on the percentage of the pool members in state UP. "
+                        "Members disabled by the administrator are not counted."
+                    ),
+                    elements=[
+                        Percentage(title=_("Warning below"), default_value=100.0),
+                        Percentage(title=_("Critical below"), default_value=50.0),
+                    ],
+                ),
+            ),
+        ]
+        + _lb_counter_elements(),
+    )
+
+
+rulespec_registry.register(
+    CheckParameterRulespecWithItem(
+        check_group_name="nsx_pools",
+        group=RulespecGroupCheckParametersApplications,
+        item_spec=lambda: TextAscii(
+            title=_("Name of pool"),
+        ),
+        match_type="dict",
+        parameter_valuespec=_parameter_valuespec_nsx_pools,
+        title=lambda: _("NSX load balancer pools"),
+    )
+)